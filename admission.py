@@ -1,52 +1,56 @@
-import heapq
+from context import current
 from events import Event    
 from scheduler import schedule    
 from reporter import log_admission_complete
 from departure import Departure
+from stats import add_wait
 
-# INTERNAL STATE
-class _AdmItem:
-    # FCFS by treatment-finish time, tie-break by patient id
-    treat_finish_time: int
-    patient_id: int
-    patient: "Patient" 
-
-nurse_busy: bool = False    # Single admission nurse shared by all P1 patients
-_adm_heap: list[tuple[int, int, "Patient"]] = []    ## Heap items are tuples: (treat_finish_time, patient_id, patient_obj)
+# The admission line and its nurses (config.admission_nurses, 1 by default)
+# are the active SimulationContext's AdmissionLine: FCFS by treatment-finish
+# time, tie-break by patient id. This module drives it from the events.
 
 # HELPERS - FOR TESTS
 def reset_admission_state():
     """Helper for tests; safe to call anytime."""
-    global nurse_busy, _adm_heap
-    nurse_busy = False
-    _adm_heap.clear()
+    from scheduler_queues_rooms import create_admission_line
+    ctx = current()
+    ctx.admission_line = create_admission_line(ctx.config.admission_nurses)
+
+def is_nurse_busy() -> bool:
+    """True when every admission nurse is busy."""
+    return current().admission_line.is_nurse_busy()
     
 # PUBLIC API
 def admission_enqueue(patient, treat_finish_time: int) -> None:
     """Queue a priority-1 patient for admission while they remain in the room."""
-    heapq.heappush(_adm_heap, (treat_finish_time, patient.id, patient))
+    current().admission_line.admission_enqueue(patient, treat_finish_time)
     
 def try_start_admission(now):
     """
-    If the nurse is idle and a P1 is waiting, start an admission.
-    Admission takes 3 time units and prints at completion.
+    While an admission nurse is idle and a P1 is waiting, start an admission.
+    Admission takes config.admission_time units (3 by default) and prints at completion.
     """
-    global nurse_busy
-    if nurse_busy or not _adm_heap:
-        return
-    nurse_busy = True
-    _, _, p = heapq.heappop(_adm_heap)
-    schedule(AdmissionComplete(t_now + 3, p))
+    ctx = current()
+    while True:
+        started = ctx.admission_line.admission_start(now)
+        if started is None:
+            return
+        p, finish, nurse = started
+        add_wait(p, "admit", now - finish)
+        schedule(AdmissionComplete(now + ctx.config.admission_time, p, nurse))
 
 class AdmissionComplete(Event):
     """
-    Occurs exactly 3 time units after an admission starts.
+    Occurs config.admission_time units (3 by default) after an admission starts.
     Print admission at completion, then schedule same-time Departure.
     """
+    def __init__(self, time, patient, nurse=0):
+        super().__init__(time, patient, "AdmissionComplete")
+        self.nurse = nurse  # admission nurse to free at completion
+
     def process(self) -> None:
-        global nurse_busy
         p, now = self.patient, self.time
         log_admission_complete(p, now)                  # print at completion
         schedule(Departure(now, p))                     # depart same tick
-        nurse_busy = False
+        current().admission_line.nurse_free(self.nurse, now)
         try_start_admission(now)                        # immediately serve next P1, if any
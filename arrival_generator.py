@@ -0,0 +1,97 @@
+# arrival_generator.py
+
+"""
+Synthetic arrival source for large-scale runs.
+
+SyntheticArrivalSource has the same next_record() interface as the file
+sources in arrival_sources, so ArrivalManager / next_arrival_if_due can be
+driven by it directly. Records are produced lazily from a Poisson process
+(or a non-homogeneous one, by thinning), so memory stays constant no matter
+how many patients are generated.
+"""
+
+import math
+import random
+
+
+def exponential_treatment(mean: float):
+    """Treatment-time sampler: exponential with the given mean, at least 1."""
+    def sample(rng):
+        return max(1, int(round(rng.expovariate(1.0 / mean))))
+    return sample
+
+
+def uniform_treatment(low: int, high: int):
+    """Treatment-time sampler: uniform integer in [low, high]."""
+    def sample(rng):
+        return rng.randint(low, high)
+    return sample
+
+
+def daily_rate_profile(base_rate: float, peak_rate: float, peak_time: float,
+                       period: float = 1440.0):
+    """
+    Time-of-day arrival rate: a sinusoid between base_rate and peak_rate
+    that peaks at peak_time in every period (1440 = minutes per day).
+
+    :return: (rate_fn, max_rate) for SyntheticArrivalSource
+    """
+    amplitude = (peak_rate - base_rate) / 2.0
+    mid = base_rate + amplitude
+
+    def rate(t):
+        return mid + amplitude * math.cos(2.0 * math.pi * (t - peak_time) / period)
+    return rate, max(base_rate, peak_rate)
+
+
+class SyntheticArrivalSource:
+    """
+    Generates (time, type, treatment_time) records on demand.
+
+    :param rate: Arrivals per time unit for a homogeneous Poisson process
+    :param rate_fn: Optional rate function of time (non-homogeneous process);
+                    needs max_rate, an upper bound used for thinning
+    :param walkin_fraction: Probability that an arrival is a walk-in ('W')
+    :param treatment: Sampler rng -> int treatment time (default exponential, mean 20)
+    :param count: Stop after this many arrivals (None = unbounded)
+    :param horizon: Stop at the first arrival at or after this time (None = unbounded)
+    :param seed: Seed for this source's own RNG
+    :param start_time: Time origin of the process
+    """
+    def __init__(self, rate: float = 1.0, rate_fn=None, max_rate=None,
+                 walkin_fraction: float = 0.5, treatment=None, count=None,
+                 horizon=None, seed=0, start_time: float = 0.0):
+        if rate_fn is not None and max_rate is None:
+            raise ValueError("rate_fn needs max_rate (an upper bound on the rate)")
+        self._rate_fn = rate_fn
+        self._max_rate = max_rate if rate_fn is not None else rate
+        if self._max_rate <= 0:
+            raise ValueError("arrival rate must be positive")
+        self._walkin_fraction = walkin_fraction
+        self._treatment = treatment or exponential_treatment(20)
+        self._remaining = count if count is not None else float("inf")
+        self._horizon = horizon
+        self._rng = random.Random(seed)
+        self._clock = float(start_time)
+
+    def next_record(self):
+        """Next (time, type, treatment_time), or None when count/horizon is reached."""
+        if self._remaining <= 0:
+            return None
+        rng = self._rng
+        clock = self._clock
+        while True:
+            clock += rng.expovariate(self._max_rate)
+            if self._horizon is not None and clock >= self._horizon:
+                self._remaining = 0
+                return None
+            # Thinning: keep a candidate with probability rate(t) / max_rate
+            if self._rate_fn is None or rng.random() * self._max_rate <= self._rate_fn(clock):
+                break
+        self._clock = clock
+        self._remaining -= 1
+        p_type = "W" if rng.random() < self._walkin_fraction else "E"
+        return (int(clock), p_type, self._treatment(rng))
+
+    def close(self):
+        self._remaining = 0
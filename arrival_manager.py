@@ -1,79 +1,105 @@
 # arrival_manager.py
 
+from context import current
 from patient import Patient
 from events import Arrival
+from arrival_sources import open_arrival_source, read_block, PrefetchingSource
 
 class ArrivalManager:
     """
     Manages the input file stream to enforce the 'only one pending Arrival event' rule.
+    Records come from a source (see arrival_sources); by default the trace
+    is memory-mapped and parsed in blocks into typed columns. The manager
+    holds one block as (times, types, treatments) lists and serves arrivals
+    by index; the pending record is the one at that index. With
+    prefetch=True the source is read ahead on a background thread.
     """
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, source=None, prefetch: bool = False):
+        self._times = self._types = self._treats = ()
+        self._i = 0
         try:
-            self.file_stream = open(filename, 'r')
-            # Read the very first line to prime the simulation
-            self.pending_arrival_data = self._read_next_line()
+            self.source = source if source is not None else open_arrival_source(filename)
+            if prefetch:
+                self.source = PrefetchingSource(self.source)
+            # Read the very first block to prime the simulation
+            self._next_block()
         except FileNotFoundError:
             print(f"Error: Input file '{filename}' not found.")
-            self.file_stream = None
-            self.pending_arrival_data = None
+            self.source = None
             
         self.filename = filename
 
-    def _read_next_line(self):
-        """Internal helper to read and parse one valid line."""
-        if not self.file_stream:
+    def _next_block(self):
+        """Internal helper to load the next block of valid records."""
+        block = read_block(self.source) if self.source else None
+        if block is None:
+            self.source = None  # End of file; the source closes itself
+            self._times = self._types = self._treats = ()
+        else:
+            self._times, self._types, self._treats = block
+        self._i = 0
+
+    @property
+    def pending_arrival_data(self):
+        """The pending (time, type, treatment_time) record, or None at end of input."""
+        i = self._i
+        if i >= len(self._times):
             return None
-        
-        while True:
-            line = self.file_stream.readline()
-            if not line:
-                self.file_stream.close()
-                self.file_stream = None
-                return None # End of file
+        return (self._times[i], self._types[i], self._treats[i])
 
-            try:
-                # Expected format: time E|W treatment_time
-                parts = line.strip().split()
-                if len(parts) == 3:
-                    time = int(parts[0])
-                    p_type = parts[1].upper()
-                    treat_time = int(parts[2])
-                    return (time, p_type, treat_time)
-                else:
-                    # Skip improperly formatted lines
-                    continue 
-            except ValueError:
-                # Skip lines with invalid numbers
-                continue
+    def advance(self):
+        """Drop the pending record; the next one in the input becomes pending."""
+        self._i += 1
+        if self._i >= len(self._times) and self.source:
+            self._next_block()
+
+    def next_arrival(self):
+        """Arrival event for the pending record (then advance), or None at end of input."""
+        i = self._i
+        if i >= len(self._times):
+            return None
+        arrival_time = self._times[i]
+        new_patient = Patient(arrival_time, self._types[i], self._treats[i])
+        self.advance()
+        return Arrival(arrival_time, new_patient)
 
+    def close(self):
+        """Close the input early (normally closed at end of file)."""
+        if self.source:
+            self.source.close()
+            self.source = None
+        self._times = self._types = self._treats = ()
+        self._i = 0
 
     def get_next_arrival_event(self, schedule_func):
         # ... (lines 92-100 remain the same) ...
-        if self.pending_arrival_data is None:
+        # 1-2. Create the Patient and its Arrival event from the pending record
+        arrival_event = self.next_arrival()
+        if arrival_event is None:
             return False # No more arrivals left
 
-        arrival_time, p_type, treat_time = self.pending_arrival_data
-        
-        # 1. Create Patient
-        new_patient = Patient(arrival_time, p_type, treat_time)
-
-        # 2. Create Arrival Event
-        arrival_event = Arrival(arrival_time, new_patient)
-
-        # Schedule the event
+        # Schedule the event (next_arrival already made the next record pending)
         schedule_func(arrival_event)
         
-        # Read the subsequent line to maintain the invariant
-        self.pending_arrival_data = self._read_next_line()
-        
         return True # Indicate an event was successfully scheduled
 
-#Role D
-_active_managers = {}  # filename -> ArrivalManager
+def sample_arrival_times(handle, limit: int = 4096):
+    """
+    Up to `limit` arrival times from the block `handle` (an ArrivalManager)
+    has already read, starting at the pending record. Creates no patients
+    and does not advance the input, so the run still serves these records.
+    Used to pick a scheduler backend.
+    """
+    i = handle._i
+    return handle._times[i:i + limit]
 
-def open_input_file(filename: str):
-    mgr = ArrivalManager(filename)
-    _active_managers[filename] = mgr
+#Role D
+def open_input_file(filename: str, source=None, prefetch: bool = False, handle=None):
+    # `source` replaces the file, e.g. a SyntheticArrivalSource;
+    # `prefetch` parses ahead on a background thread; `handle` is an
+    # ArrivalManager already opened on the file (e.g. to sample it)
+    mgr = handle if handle is not None else ArrivalManager(filename, source=source, prefetch=prefetch)
+    current().arrival_manager = mgr  # the active run's input
     return mgr  # return as a “handle” for next_arrival_if_due
 
 def next_arrival_if_due(handle, now: int):
@@ -85,14 +111,6 @@ def next_arrival_if_due(handle, now: int):
     # We’ll mirror your existing API but return the event for convenience.
     # Slight tweak: produce the event instead of scheduling it internally.
     # To do that, expose a variant that returns the Arrival instead of scheduling.
-    if handle.pending_arrival_data is None:
-        return None
-
-    arrival_time, p_type, treat_time = handle.pending_arrival_data
-    new_patient = Patient(arrival_time, p_type, treat_time)
-    arrival_event = Arrival(arrival_time, new_patient)
-
-    # move the file forward one line, preserving the “one pending” invariant
-    handle.pending_arrival_data = handle._read_next_line()
-
-    return arrival_event
+    # next_arrival() moves the input forward one record, preserving the
+    # “one pending” invariant
+    return handle.next_arrival()
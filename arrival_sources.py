@@ -0,0 +1,675 @@
+# arrival_sources.py
+
+"""
+Record sources for ArrivalManager.
+
+A source hands out parsed arrival records one at a time through
+next_record(), returning (time, type, treatment_time) tuples and None at the
+end of input. ColumnarSources also hand out whole blocks as column lists
+through read_block(), which is what ArrivalManager serves from. The text
+source memory-maps the trace and parses it in large blocks into typed
+columns. With NumPy a block is tokenized as one uint8 array and each
+column is converted in bulk, so no Python object is made per line until
+the block is handed out; without it the per-line work happens inside the
+regex engine and array constructors. On a 1M-line trace that is about
+0.2s against 0.8s for the old readline()/split()/int() loop (0.6s for the
+regex path). The binary source reads a pre-converted columnar trace
+straight out of the memory map without parsing at all.
+gzip/bz2/xz text traces are recognised by their magic bytes and streamed
+through the same block parser without decompressing to disk.
+"""
+
+import abc
+import bz2
+import gzip
+import lzma
+import mmap
+import queue
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# One arrival per line: "time TYPE treatment_time". Anything else (wrong
+# token count, non-integer fields) is skipped, like the old line parser did.
+_LINE_RE = re.compile(
+    rb"^[ \t\f\v]*([+-]?[0-9]+)[ \t\f\v]+(\S+)[ \t\f\v]+([+-]?[0-9]+)[ \t\f\v\r]*$",
+    re.MULTILINE,
+)
+
+# Whole-block check: every line is well formed (possessive quantifiers keep
+# it linear; they need Python 3.11, older versions always take the slow path)
+try:
+    _CLEAN_BLOCK_RE = re.compile(
+        rb"(?:[ \t\f\v]*+[+-]?+[0-9]++[ \t\f\v]++\S++[ \t\f\v]++[+-]?+[0-9]++"
+        rb"[ \t\f\v\r]*+(?:\n|\Z))*+"
+    )
+except re.error:
+    _CLEAN_BLOCK_RE = None
+
+DEFAULT_BLOCK_SIZE = 1 << 22  # 4 MiB of text per parse
+
+
+class TypeTable:
+    """
+    Maps patient-type tokens to small integer codes (the uint8 type column)
+    and back to the upper-cased names ArrivalManager hands out.
+    """
+    def __init__(self):
+        self.names = []     # code -> name, e.g. ['E', 'W']
+        self._codes = {}    # raw token bytes -> code
+
+    def code(self, token: bytes) -> int:
+        code = self._codes.get(token)
+        if code is None:
+            name = token.decode("utf-8", "replace").upper()
+            if name in self.names:
+                code = self.names.index(name)
+            else:
+                if len(self.names) >= 256:
+                    raise ValueError("more than 256 distinct patient types in trace")
+                code = len(self.names)
+                self.names.append(name)
+            self._codes[token] = code
+        return code
+
+
+def _parse_block_python(data, types: TypeTable):
+    # Without NumPy: the regex engine splits the lines, array() converts
+    if _CLEAN_BLOCK_RE is not None and _CLEAN_BLOCK_RE.fullmatch(data):
+        # Common case: no malformed lines, so the columns are every third token
+        fields = data.split()
+        times, tokens, treats = fields[0::3], fields[1::3], fields[2::3]
+    else:
+        rows = _LINE_RE.findall(data)
+        if not rows:
+            return array("q"), array("B"), array("q")
+        times, tokens, treats = zip(*rows)
+    codes = {token: types.code(token) for token in set(tokens)}
+    return (array("q", map(int, times)),
+            array("B", map(codes.__getitem__, tokens)),
+            array("q", map(int, treats)))
+
+
+if np is not None:
+    # Byte classes for the vectorized tokenizer, as the old text-mode
+    # readline()/split() saw them: lines end at \n or \r, and fields are
+    # separated by any other ASCII whitespace
+    _IS_NEWLINE = np.zeros(256, dtype=bool)
+    _IS_NEWLINE[list(b"\n\r")] = True
+    _IS_SEP = _IS_NEWLINE.copy()
+    _IS_SEP[list(b" \t\v\f\x1c\x1d\x1e\x1f")] = True
+    _EMPTY_COLUMNS = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint8),
+                      np.zeros(0, dtype=np.int64))
+
+# int64 holds every 18-digit number; longer ones take the Python path
+_MAX_DIGITS = 18
+
+
+def _separators(buf):
+    """Separator mask of a uint8 block."""
+    # Every separator is <= 32; the LUT is only needed when the block also
+    # holds other control bytes
+    if ((buf < 9) | ((buf > 13) & (buf < 28))).any():
+        return _IS_SEP[buf]
+    return buf <= 32
+
+
+def _line_breaks(buf, starts, ends):
+    """True for each token after the first that starts a new line."""
+    gap_start, gap_end = ends[:-1], starts[1:]
+    breaks = _IS_NEWLINE[buf[gap_start]]
+    # Longer gaps ("  \r\n", trailing blanks) may hold a newline further in
+    longer = np.flatnonzero(~breaks & (gap_end - gap_start > 1))
+    newlines = np.flatnonzero(_IS_NEWLINE[buf]) if len(longer) else ()
+    if len(newlines):
+        nxt = np.searchsorted(newlines, gap_start[longer])
+        found = nxt < len(newlines)
+        nxt[~found] = 0
+        breaks[longer] = found & (newlines[nxt] < gap_end[longer])
+    return breaks
+
+
+def _int_column(buf, starts, ends):
+    """
+    Convert the tokens buf[starts[k]:ends[k]] to int64 with Horner's rule,
+    one vectorized step per digit position (right-aligned).
+
+    :return: (values, ok) where ok marks tokens matching [+-]?[0-9]+,
+             or None if a number is too long for int64
+    """
+    sign = (buf[starts] == ord("+")) | (buf[starts] == ord("-"))
+    first = starts + sign
+    digits = ends - first
+    ok = (digits > 0) & (digits <= _MAX_DIGITS)
+    too_long = np.flatnonzero(digits > _MAX_DIGITS)
+    if any(bytes(buf[first[k]:ends[k]]).isdigit() for k in too_long):
+        return None
+    width = int(digits[ok].max(initial=1))
+    # Up to 9 digits always fit in int32, which halves the memory traffic
+    values = np.zeros(len(starts), dtype=np.int32 if width <= 9 else np.int64)
+    for k in range(width, 0, -1):
+        pos = ends - k  # ascending, like ends
+        outside = pos < first
+        if pos[0] < 0:
+            pos = np.maximum(pos, 0)
+        digit = buf[pos] - np.uint8(ord("0"))
+        digit[outside] = 0
+        ok &= digit <= 9
+        values *= 10
+        values += digit
+    values[buf[starts] == ord("-")] *= -1
+    return values.astype(np.int64, copy=False), ok
+
+
+def _type_codes(buf, starts, ends, types: TypeTable):
+    """Type code of every token, mapping each distinct token once."""
+    width = int((ends - starts).max(initial=1))
+    if width == 1:
+        # One-byte types ('E', 'W'): a 256-entry lookup table
+        first = buf[starts]
+        lut = np.zeros(256, dtype=np.uint8)
+        for byte in np.flatnonzero(np.bincount(first, minlength=256)):
+            lut[byte] = types.code(bytes([byte]))
+        return lut[first]
+    pos = starts[:, None] + np.arange(width)
+    padded = np.where(pos < ends[:, None], buf[np.minimum(pos, len(buf) - 1)], 0)
+    tokens = np.ascontiguousarray(padded, dtype=np.uint8).view(f"S{width}").ravel()
+    distinct, inverse = np.unique(tokens, return_inverse=True)
+    lut = np.array([types.code(bytes(token)) for token in distinct], dtype=np.uint8)
+    return lut[inverse.ravel()]
+
+
+def _parse_block_numpy(data, types: TypeTable):
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if not len(buf):
+        return None
+    sep = _separators(buf)
+    # Token boundaries: a non-separator byte after a separator (or at 0)
+    # starts a token, one before a separator (or at the end) ends it
+    edge = np.empty(len(buf) + 1, dtype=bool)
+    edge[0] = edge[-1] = True
+    np.not_equal(sep[1:], sep[:-1], out=edge[1:-1])
+    bounds = np.flatnonzero(edge)
+    if sep[0]:
+        bounds = bounds[1:]
+    if len(bounds) % 2:
+        bounds = bounds[:-1]
+    starts, ends = bounds[0::2], bounds[1::2]
+    if not len(starts):
+        return None
+
+    # Keep the lines with exactly three tokens; their tokens sit next to
+    # each other, so the three columns are a reshape away
+    breaks = _line_breaks(buf, starts, ends)
+    clean = (len(starts) % 3 == 0 and breaks[2::3].all()
+             and not breaks[0::3].any() and not breaks[1::3].any())
+    if not clean:
+        line = np.zeros(len(starts), dtype=np.int64)
+        np.cumsum(breaks, out=line[1:])
+        keep = np.bincount(line)[line] == 3
+        starts, ends = starts[keep], ends[keep]
+    starts = starts.reshape(-1, 3)
+    ends = ends.reshape(-1, 3)
+    if not len(starts):
+        return None
+
+    time_col = _int_column(buf, starts[:, 0], ends[:, 0])
+    treat_col = _int_column(buf, starts[:, 2], ends[:, 2])
+    if time_col is None or treat_col is None:
+        # 19+ digit numbers: array('q') takes them (or raises OverflowError)
+        return _parse_block_python(data, types)
+    (times, times_ok), (treats, treats_ok) = time_col, treat_col
+    ok = times_ok & treats_ok
+    codes = _type_codes(buf, starts[ok, 1], ends[ok, 1], types)
+    return times[ok], codes, treats[ok]
+
+
+def parse_arrival_block(data, types: TypeTable):
+    """
+    Parse a block of complete lines into three typed columns.
+
+    With NumPy the block is tokenized as one uint8 array and every column
+    is converted in bulk; otherwise the regex/array path is used.
+
+    :param data: bytes-like block ending on a line boundary
+    :param types: TypeTable shared by every block of the trace
+    :return: (times int64, type codes uint8, treatments int64) as NumPy
+             arrays, or array('q'/'B'/'q') columns without NumPy
+    """
+    if np is not None:
+        columns = _parse_block_numpy(data, types)
+        if columns is None:
+            return _EMPTY_COLUMNS
+        return columns
+    return _parse_block_python(data, types)
+
+
+def _column_lists(times, codes, treats, names):
+    """Columns as (times, type names, treatments) lists, converted in bulk."""
+    return times.tolist(), list(map(names.__getitem__, codes)), treats.tolist()
+
+
+class ColumnarSource(abc.ABC):
+    """
+    A source that produces records a block at a time as columns. Callers
+    that want the columns (ArrivalManager, PrefetchingSource) take whole
+    blocks through read_block(); next_record() serves the same blocks one
+    record at a time.
+    """
+    def __init__(self):
+        self._times = self._types = self._treats = ()
+        self._i = 0
+
+    @abc.abstractmethod
+    def _next_columns(self):
+        """Next non-empty (times, types, treatments) lists, or None at end."""
+
+    def read_block(self):
+        """
+        Next block of (times, types, treatments) lists, or None at end of
+        input. A block partly served by next_record() is finished first.
+        """
+        i, times = self._i, self._times
+        if i < len(times):
+            self._i = len(times)
+            return times[i:], self._types[i:], self._treats[i:]
+        return self._next_columns()
+
+    def next_record(self):
+        """Next (time, type, treatment_time), or None at end of input."""
+        i = self._i
+        if i >= len(self._times):
+            block = self._next_columns()
+            if block is None:
+                return None
+            self._times, self._types, self._treats = block
+            i = 0
+        self._i = i + 1
+        return (self._times[i], self._types[i], self._treats[i])
+
+    def close(self):
+        self._times = self._types = self._treats = ()
+        self._i = 0
+
+
+def read_block(source, records: int = 1):
+    """
+    Next block of `source` as (times, types, treatments) lists, or None at
+    end of input. ColumnarSources hand out a whole parsed block; other
+    sources (e.g. SyntheticArrivalSource) are read `records` at a time.
+    """
+    if isinstance(source, ColumnarSource):
+        return source.read_block()
+    rows = []
+    while len(rows) < records:
+        record = source.next_record()
+        if record is None:
+            break
+        rows.append(record)
+    if not rows:
+        return None
+    return tuple(map(list, zip(*rows)))
+
+
+class BlockTextSource(ColumnarSource):
+    """
+    Serves records from text blocks produced by _blocks(), one parsed block
+    (columns) at a time. Subclasses only supply the blocks.
+    """
+    def __init__(self):
+        super().__init__()
+        self.types = TypeTable()
+        self._block_iter = None
+
+    @abc.abstractmethod
+    def _blocks(self):
+        """Yield bytes-like blocks that each end on a line boundary."""
+
+    def _next_columns(self):
+        if self._block_iter is None:
+            self._block_iter = self._blocks()
+        for block in self._block_iter:
+            times, codes, treats = parse_arrival_block(block, self.types)
+            if len(times):
+                return _column_lists(times, codes, treats, self.types.names)
+        self.close()
+        return None
+
+    def iter_columns(self):
+        """Yield typed (times, type codes, treatments) columns block by block."""
+        for block in self._blocks():
+            columns = parse_arrival_block(block, self.types)
+            if len(columns[0]):
+                yield columns
+        self.close()
+
+    def close(self):
+        super().close()
+        self._block_iter = iter(())
+
+
+class MappedTextSource(BlockTextSource):
+    """
+    Memory-maps a whitespace text trace and parses it block by block.
+    Blocks are cut at the last newline, so no line is ever split.
+    """
+    def __init__(self, filename: str, block_size: int = DEFAULT_BLOCK_SIZE):
+        super().__init__()
+        self.filename = filename
+        self.block_size = block_size
+        self._file = open(filename, "rb")
+        self._map = None
+
+    def _blocks(self):
+        size = self._file.seek(0, 2)
+        if size == 0:
+            return
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        mm, pos = self._map, 0
+        while pos < size:
+            end = min(pos + self.block_size, size)
+            if end < size:
+                cut = mm.rfind(b"\n", pos, end)
+                if cut == -1:
+                    # A single line longer than the block: extend to its end
+                    cut = mm.find(b"\n", end)
+                end = size if cut == -1 else cut + 1
+            yield mm[pos:end]
+            pos = end
+
+    def close(self):
+        super().close()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# Magic bytes -> opener for compressed text traces
+_COMPRESSED_FORMATS = (
+    (b"\x1f\x8b", gzip.open),
+    (b"BZh", bz2.open),
+    (b"\xfd7zXZ\x00", lzma.open),
+)
+
+
+class CompressedTextSource(BlockTextSource):
+    """
+    Streams a compressed text trace: decompresses read_size bytes at a time
+    and parses complete lines block by block, carrying the partial last
+    line into the next block. Only one block of decompressed text is held
+    in memory at a time.
+    """
+    def __init__(self, filename: str, opener, read_size: int = DEFAULT_BLOCK_SIZE):
+        super().__init__()
+        self.filename = filename
+        self.read_size = read_size
+        self._stream = opener(filename, "rb")
+
+    def _blocks(self):
+        read, carry = self._stream.read, b""
+        chunk = read(self.read_size)
+        if chunk.startswith(TRACE_MAGIC):
+            raise ValueError(f"'{self.filename}' is a compressed binary trace; "
+                             "decompress it so it can be memory-mapped")
+        while True:
+            if not chunk:
+                if carry:
+                    yield carry
+                return
+            cut = chunk.rfind(b"\n")
+            if cut == -1:
+                carry += chunk
+            else:
+                yield carry + chunk[:cut + 1]
+                carry = chunk[cut + 1:]
+            chunk = read(self.read_size)
+
+    def close(self):
+        super().close()
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+# BINARY TRACE FORMAT
+# ============================================================================
+# Little-endian, columnar so every column can be viewed in place:
+#   header (32 bytes): magic, record count (uint64), min/max time (int32),
+#                      type table length (uint32), 4 bytes padding
+#   times       int32[count]
+#   treatments  int32[count]
+#   types       uint8[count]   (codes into the type table)
+#   type table  names joined by b"\n"
+
+TRACE_MAGIC = b"ERTRACE1"
+_HEADER = struct.Struct("<8sQiiI4x")
+
+
+def read_trace_header(filename: str) -> dict:
+    """Return count and time range of a binary trace without reading records."""
+    with open(filename, "rb") as f:
+        magic, count, t_min, t_max, table_len = _HEADER.unpack(f.read(_HEADER.size))
+    if magic != TRACE_MAGIC:
+        raise ValueError(f"'{filename}' is not a binary arrival trace")
+    return {"count": count, "min_time": t_min, "max_time": t_max, "table_len": table_len}
+
+
+def _int32_le(column):
+    """
+    A parsed column as little-endian int32, with its min and max.
+
+    :raises OverflowError: if a value does not fit in int32
+    """
+    if np is not None and isinstance(column, np.ndarray):
+        lo, hi = int(column.min()), int(column.max())
+        if lo < -(1 << 31) or hi >= 1 << 31:
+            raise OverflowError("int32 overflow")
+        return column.astype("<i4"), lo, hi
+    column32 = array("i", column)
+    lo, hi = min(column32), max(column32)
+    if sys.byteorder == "big":
+        column32.byteswap()
+    return column32, lo, hi
+
+
+def convert_text_to_binary(src: str, dst: str) -> int:
+    """
+    Convert a whitespace text trace into the binary format.
+
+    Streams block by block: times go straight to `dst`, the other two
+    columns are spooled to temporary files and appended at the end.
+
+    :return: Number of records written
+    """
+    text = open_arrival_source(src)
+    count, t_min, t_max = 0, 0, 0
+    with open(dst, "wb") as out, tempfile.TemporaryFile() as treats_tmp, \
+            tempfile.TemporaryFile() as types_tmp:
+        out.write(bytes(_HEADER.size))
+        for times, codes, treats in text.iter_columns():
+            try:
+                (times32, lo, hi), (treats32, _, _) = _int32_le(times), _int32_le(treats)
+            except OverflowError:
+                raise ValueError("trace values do not fit in int32") from None
+            if count == 0:
+                t_min, t_max = lo, hi
+            t_min, t_max = min(t_min, lo), max(t_max, hi)
+            times32.tofile(out)
+            treats32.tofile(treats_tmp)
+            codes.tofile(types_tmp)
+            count += len(times32)
+        for tmp in (treats_tmp, types_tmp):
+            tmp.seek(0)
+            shutil.copyfileobj(tmp, out, 1 << 20)
+        table = "\n".join(text.types.names).encode("utf-8")
+        out.write(table)
+        out.seek(0)
+        out.write(_HEADER.pack(TRACE_MAGIC, count, t_min, t_max, len(table)))
+    return count
+
+
+class BinaryArrivalSource(ColumnarSource):
+    """
+    Serves records from a binary trace through memoryviews over the memory
+    map, so nothing is parsed: each block is a slice of the columns,
+    converted to lists in one call per column.
+    """
+    def __init__(self, filename: str, block_records: int = 1 << 16):
+        super().__init__()
+        self.filename = filename
+        self.block_records = block_records
+        self._file = open(filename, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, self.min_time, self.max_time, table_len = _HEADER.unpack_from(self._map)
+        if magic != TRACE_MAGIC:
+            self._map.close()
+            self._file.close()
+            raise ValueError(f"'{filename}' is not a binary arrival trace")
+        self.count = count
+        start = _HEADER.size
+        view = memoryview(self._map)
+        times = view[start:start + 4 * count]
+        treats = view[start + 4 * count:start + 8 * count]
+        self._codes = view[start + 8 * count:start + 9 * count]
+        table = bytes(view[start + 9 * count:start + 9 * count + table_len])
+        self.type_names = table.decode("utf-8").split("\n") if table_len else []
+        if sys.byteorder == "little":
+            self._time_col, self._treat_col = times.cast("i"), treats.cast("i")
+        else:
+            # Big-endian hosts pay one copy to swap the columns
+            self._time_col, self._treat_col = array("i", times), array("i", treats)
+            self._time_col.byteswap()
+            self._treat_col.byteswap()
+        self._views = (times, treats, view)  # released innermost first
+        self._pos = 0
+
+    def _next_columns(self):
+        i = self._pos
+        if i >= self.count:
+            self.close()
+            return None
+        j = self._pos = min(i + self.block_records, self.count)
+        return _column_lists(self._time_col[i:j], self._codes[i:j],
+                             self._treat_col[i:j], self.type_names)
+
+    def close(self):
+        super().close()
+        if self._map is None:
+            return
+        self.count = self._pos = 0
+        for view in (self._time_col, self._treat_col, self._codes):
+            if isinstance(view, memoryview):
+                view.release()
+        for view in self._views:
+            view.release()
+        self._map.close()
+        self._map = None
+        self._file.close()
+
+
+# BACKGROUND PREFETCH
+# ============================================================================
+
+class PrefetchingSource(ColumnarSource):
+    """
+    Wraps any source and reads it ahead on a background thread.
+
+    The reader thread pulls blocks into a bounded queue (the ring buffer):
+    whole parsed blocks from a ColumnarSource, chunk_size records at a time
+    from any other source. When max_chunks blocks are waiting it blocks
+    until the engine catches up. The engine side only takes already-parsed
+    blocks, so file I/O and parsing stay off the event loop. ArrivalManager
+    still holds exactly one pending record, so its invariant is unchanged.
+    """
+    _END = object()
+
+    def __init__(self, inner, chunk_size: int = 4096, max_chunks: int = 8):
+        super().__init__()
+        self._inner = inner
+        self._chunk_size = chunk_size
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._stop = threading.Event()
+        self._done = False
+        self._thread = threading.Thread(target=self._run, name="arrival-prefetch", daemon=True)
+        self._thread.start()
+
+    def _put(self, item) -> bool:
+        """Blocking put that gives up when close() is called."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        inner, size = self._inner, self._chunk_size
+        try:
+            while not self._stop.is_set():
+                block = read_block(inner, size)
+                if block is None:
+                    self._put(self._END)
+                    return
+                if not self._put(block):
+                    return
+        except Exception as exc:  # hand the failure to the engine thread
+            self._put(exc)
+
+    def _next_columns(self):
+        if self._done:
+            return None
+        item = self._queue.get()
+        if item is self._END:
+            self.close()
+            return None
+        if isinstance(item, Exception):
+            self.close()
+            raise item
+        return item
+
+    def close(self):
+        super().close()
+        if self._done:
+            return
+        self._done = True
+        self._stop.set()
+        self._thread.join()
+        self._inner.close()
+
+
+def open_arrival_source(filename: str):
+    """
+    Open the right record source for a trace file, chosen by its first bytes.
+
+    :raises FileNotFoundError: if the file does not exist
+    """
+    with open(filename, "rb") as f:
+        magic = f.read(len(TRACE_MAGIC))
+    if magic == TRACE_MAGIC:
+        return BinaryArrivalSource(filename)
+    for prefix, opener in _COMPRESSED_FORMATS:
+        if magic.startswith(prefix):
+            return CompressedTextSource(filename, opener)
+    return MappedTextSource(filename)
+
+
+if __name__ == "__main__":
+    # python arrival_sources.py trace.txt trace.bin
+    if len(sys.argv) != 3:
+        print("usage: python arrival_sources.py <text trace> <binary trace>")
+        sys.exit(2)
+    n = convert_text_to_binary(sys.argv[1], sys.argv[2])
+    print(f"Wrote {n} records to {sys.argv[2]}")
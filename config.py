@@ -0,0 +1,45 @@
+# config.py
+
+"""
+Capacity and timing parameters of the ER model. The defaults are the
+assignment's: 3 treatment rooms, one triage and one admission nurse, a
+4-unit triage assessment, a 3-unit admission and departure 1 unit after
+treatment for priorities 2-5.
+"""
+
+from dataclasses import dataclass, asdict, fields
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    total_rooms: int = 3
+    assessment_time: int = 4
+    admission_time: int = 3
+    departure_delay: int = 1
+    triage_nurses: int = 1
+    admission_nurses: int = 1
+    aging_interval: int = 0  # > 0: waiting patients move up a rank per interval waited
+    aging_floor: int = 2     # best rank aging reaches; rank 1 stays with emergencies
+
+    def key(self) -> tuple:
+        """Hashable, order-stable identity (used as a sweep cache key)."""
+        return tuple(sorted(asdict(self).items()))
+
+
+DEFAULT_CONFIG = SimulationConfig()
+
+
+def expand_grid(**axes) -> list:
+    """
+    Every combination of the given parameter values, e.g.
+    expand_grid(total_rooms=[2, 3, 4], admission_time=[3, 5]) -> 6 configs.
+    Parameters not given keep their defaults.
+    """
+    known = {f.name for f in fields(SimulationConfig)}
+    unknown = set(axes) - known
+    if unknown:
+        raise ValueError(f"unknown config parameter(s): {', '.join(sorted(unknown))}")
+    configs = [{}]
+    for name, values in axes.items():
+        configs = [dict(c, **{name: v}) for c in configs for v in values]
+    return [SimulationConfig(**c) for c in configs]
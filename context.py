@@ -0,0 +1,118 @@
+# context.py
+
+"""
+Per-run simulation state.
+
+Everything a run mutates - the scheduler, queues and rooms, the patient id
+counter and patient list, the triage RNG, the nurses, the event logger and
+the treatment / departure hooks - lives on one SimulationContext instead of
+in module globals. The module-level helpers (scheduler.schedule, rooms.release,
+admission.try_start_admission, ...) act on current(), the context active in
+this thread or task, so runs in one process never see each other's state and
+a finished run is reclaimed as soon as its context is dropped.
+"""
+
+import contextvars
+import random
+
+from config import DEFAULT_CONFIG
+from scheduler_queues_rooms import create_all_resources
+
+FIRST_PATIENT_ID = 28064212  # Start ID per assignment spec
+TRIAGE_RNG_SEED = 184        # Produces walk-in priorities [3, 1, 2] for data1
+
+
+class SimulationContext:
+    """
+    All mutable state of one simulation run. Activate it with `with ctx:`
+    (or ctx.run(fn, ...)); contexts nest and are per thread / asyncio task.
+
+    :param scheduler_backend: Scheduler backend name (see create_scheduler)
+    :param arrival_times: Sample of arrival times for scheduler_backend='auto'
+    :param triage_seed: Seed of this run's triage RNG
+    :param first_patient_id: Id given to the run's first patient
+    :param retain_patients: Keep every patient in .patients (off in streaming mode)
+    :param config: SimulationConfig with room and nurse counts and stage durations
+    :param streams: Optional RandomStreams; when given, triage draws each
+                    patient's priority from it (common random numbers)
+                    instead of from the sequential triage RNG
+    :param logger: reporter.Logger for the event log (default: every event
+                   line straight to stdout)
+    """
+    def __init__(self, scheduler_backend='heap', arrival_times=None,
+                 triage_seed=TRIAGE_RNG_SEED, first_patient_id=FIRST_PATIENT_ID,
+                 retain_patients=True, config=DEFAULT_CONFIG, streams=None, logger=None):
+        from reporter import Logger  # reporter imports this module
+        self.config = config
+        self.streams = streams
+        self.logger = Logger() if logger is None else logger
+        res = create_all_resources(scheduler_backend=scheduler_backend,
+                                   arrival_times=arrival_times,
+                                   total_rooms=config.total_rooms,
+                                   triage_nurses=config.triage_nurses,
+                                   admission_nurses=config.admission_nurses,
+                                   aging_interval=config.aging_interval,
+                                   aging_floor=config.aging_floor)
+        self.scheduler = res['scheduler']
+        self.assessment_line = res['assessment_line']
+        self.waiting_room = res['waiting_room']
+        self.admission_line = res['admission_line']  # P1s and admission nurses (Role D)
+        self.rooms = res['rooms']
+
+        # Patients
+        self.next_patient_id = first_patient_id
+        self.patients = []
+        self.retain_patients = retain_patients
+
+        # Triage (Role A) nurses
+        self.triage_rng = random.Random(triage_seed)
+        self.triage_nurses = res['triage_nurses']  # NursePool of config.triage_nurses
+
+        # Hooks wired up by main
+        self.controller = None      # TreatmentController
+        self.backfill_cb = None     # callable(now), called on every Departure
+        self.departure_sink = None  # callable(patient, now), e.g. RunningSummary.fold
+        self.arrival_manager = None
+        self.summary = None         # RunningSummary of a streaming run
+
+        self._tokens = []
+
+    def add_patient(self, patient) -> int:
+        """Give a new patient the next id and register it; returns the id."""
+        pid = self.next_patient_id
+        self.next_patient_id = pid + 1
+        if self.retain_patients:
+            self.patients.append(patient)
+        return pid
+
+    def __enter__(self):
+        self._tokens.append(_current.set(self))
+        return self
+
+    def __exit__(self, *exc):
+        _current.reset(self._tokens.pop())
+        return False
+
+    def run(self, fn, *args, **kwargs):
+        """Call fn(*args, **kwargs) with this context active."""
+        with self:
+            return fn(*args, **kwargs)
+
+
+_current = contextvars.ContextVar("simulation_context", default=None)
+_default = None
+
+
+def current() -> SimulationContext:
+    """The active context, or the process-wide default one if none is active."""
+    ctx = _current.get()
+    if ctx is None:
+        ctx = _default if _default is not None else reset_default_context()
+    return ctx
+
+
+def reset_default_context(**kwargs) -> SimulationContext:
+    """Replace the default context with a fresh one (for tests and demos)."""
+    global _default
+    _default = SimulationContext(**kwargs)
+    return _default
@@ -1,17 +1,25 @@
+from context import current
 from events import Event
-from rooms import release, available_count
 from reporter import log_departure
 
-# Backfill callback, to be set by whoever constructs TreatmentController
-_BACKFILL_CB = None
+# Hooks live on the active SimulationContext:
+#  - backfill callback, called on every departure (treatment backfill)
+#  - departure sink, e.g. RunningSummary.fold in streaming mode: the patient's
+#    record is folded in here and nothing else keeps the patient alive
 def register_backfill_callback(fn):
-    global _BACKFILL_CB
-    _BACKFILL_CB = fn
+    current().backfill_cb = fn
+
+def register_departure_sink(fn):
+    current().departure_sink = fn
 
 class Departure(Event):
     def process(self):
         p, now = self.patient, self.time
-        release()  # room becomes free ONLY now
-        log_departure(p, now, available_count())
-        if _BACKFILL_CB is not None:
-            _BACKFILL_CB(now)
+        ctx = current()
+        p.departure_time = now
+        ctx.rooms.release(p.treatment_room_id, now)  # room becomes free ONLY now
+        log_departure(p, now, ctx.rooms.get_available_count())
+        if ctx.departure_sink is not None:
+            ctx.departure_sink(p, now)
+        if ctx.backfill_cb is not None:
+            ctx.backfill_cb(now)
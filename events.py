@@ -7,10 +7,10 @@ class Event:
     """
     Base class for all simulation events.
     """
-    def __init__(self, time: int, patient: Patient, event_type: str):
+    def __init__(self, time: int, patient: Patient, event_type: str = None):
         self.time = time
         self.patient = patient
-        self.event_type = event_type
+        self.event_type = event_type or type(self).__name__
 
     def __repr__(self):
         return f"<{self.event_type} @ Time {self.time} | P: {self.patient.id} | Pri: {self.patient.priority or 'N/A'}>"
@@ -34,22 +34,66 @@ class Event:
         return self.patient.id < other.patient.id
 
 # Events generated by Role A
+# (handlers import lazily: triage_logic and treatment import this module)
 class Arrival(Event):
     def __init__(self, time, patient):
         super().__init__(time, patient, "Arrival")
 
+    def process(self):
+        from context import current
+        from reporter import log_arrival
+        from triage_logic import handle_arrival_event, try_start_assessment
+        ctx = current()
+        log_arrival(self.patient, self.time)
+        # main keeps the one-pending-Arrival invariant, so no arrival manager here
+        handle_arrival_event(self, ctx.scheduler.schedule,
+                             lambda p: ctx.triage_nurses.request(p, self.time), None)
+        if self.patient.type == 'W':
+            try_start_assessment(self.time)
+
 class AssessmentDone(Event):
-    # This event is scheduled 4 units after assessment starts
-    def __init__(self, time, patient):
+    # This event is scheduled 4 units after assessment starts, and frees
+    # the triage nurse (numbered from 0) who did the assessment
+    def __init__(self, time, patient, nurse=0):
         super().__init__(time, patient, "AssessmentDone")
+        self.nurse = nurse
+
+    def process(self):
+        from context import current
+        from reporter import log_assessment_done
+        from triage_logic import handle_assessment_done_event, try_start_assessment
+        ctx = current()
+        ctx.triage_nurses.release(self.nurse, self.time)
+        log_assessment_done(self.patient, self.time)
+        handle_assessment_done_event(self, ctx.scheduler.schedule)
+        try_start_assessment(self.time)  # next walk-in in line, if any
 
 class EnterWaitingRoom(Event):
     # This event hands off the patient to Role B's Waiting Room PQ
     def __init__(self, time, patient):
         super().__init__(time, patient, "EnterWaitingRoom")
 
+    def process(self):
+        from context import current
+        from reporter import log_enter_waiting_room
+        from treatment import on_enter_waiting_room
+        p, now = self.patient, self.time
+        p.treatment_wait_start = now
+        current().rooms.request(p, now)  # into the waiting room, the rooms' queue
+        log_enter_waiting_room(p, now)
+        on_enter_waiting_room(now)
+
 # Placeholder stubs for other events (to complete the system)
 class StartTreatment(Event): pass
-class TreatmentCompleted(Event): pass
+
+class TreatmentCompleted(Event):
+    def __init__(self, time, patient):
+        super().__init__(time, patient, "TreatmentCompleted")
+
+    def process(self):
+        # Room stays occupied until Departure; the controller routes the patient
+        from context import current
+        current().controller.handle_treatment_completed(self)
+
 class Departure(Event): pass
-class AdmittingToHospital(Event): pass
\ No newline at end of file
+class AdmittingToHospital(Event): pass
@@ -0,0 +1,371 @@
+# lockstep.py
+
+"""
+Lockstep engine: many replications of one trace advanced together.
+
+Replications of a trace differ only in the walk-in priorities drawn at
+triage, so arrivals and the FIFO triage stage are computed once, and the
+rooms, waiting room, admission nurses and per-patient waits of all R
+replications are NumPy arrays stepped one tick at a time together. Each
+tick handles the batch of events due then across every replication, with
+the event engine's tick semantics:
+
+  - treatment completions, admission starts/completions and departures of
+    a tick are handled first (P1s wait for an admission nurse in
+    (treatment finish, id) order; P2-5 leave departure_delay later);
+  - then, once per tick, free rooms are filled from the waiting room in
+    (priority, id) order.
+
+The waiting room of a replication is six FIFO queues: emergencies (all
+P1) and walk-ins of each priority. Each queue enters in id order, so its
+head is its best patient, and filling a room is a min over six heads.
+
+run_lockstep returns the same summaries as replications.run_replication
+for the same seeds. NumPy is optional: it is only imported when this
+engine is used.
+"""
+
+import heapq
+import random
+
+from config import DEFAULT_CONFIG, SimulationConfig
+from context import FIRST_PATIENT_ID
+from random_streams import RandomStreams, PRIORITY_STREAM
+from stats import SUMMARY_PERCENTILES, percentile
+
+try:
+    import numpy as np
+    _EMPTY = np.zeros(0, dtype=np.int64)
+except ImportError:  # optional dependency
+    np = None
+
+# Event kinds in the per-tick buckets
+TREATMENT_DONE, ADMISSION_DONE, DEPARTURE = range(3)
+
+_NONE = 1 << 62  # key of an empty waiting-room queue
+
+
+def read_trace(trace: str) -> list:
+    """All (time, type, treatment_time) records of a trace, in file order."""
+    from arrival_sources import open_arrival_source
+    source = open_arrival_source(trace)
+    records = []
+    record = source.next_record()
+    while record is not None:
+        records.append(record)
+        record = source.next_record()
+    return records
+
+
+def triage_stage(arrivals, is_walkin, assessment_time: int, nurses: int = 1):
+    """
+    The FIFO triage stage with `nurses` nurses, identical in every
+    replication: each walk-in starts when it arrives or when the earliest
+    nurse frees up, whichever is later.
+
+    :return: (assessment start per patient (arrival for emergencies),
+              waiting-room entry time per patient)
+    """
+    start = arrivals.copy()
+    entry = arrivals.copy()
+    nurse_free = [int(arrivals[0])] * nurses if len(arrivals) else []
+    for i in np.flatnonzero(is_walkin):
+        s = max(int(arrivals[i]), nurse_free[0])
+        start[i] = s
+        entry[i] = s + assessment_time
+        heapq.heapreplace(nurse_free, entry[i])
+    return start, entry
+
+
+def draw_priorities(walkin_ids, seeds, crn: bool = False, antithetic: bool = False):
+    """
+    Walk-in priorities, shape (R, walk-ins): the sequential triage RNG per
+    seed (walk-ins are triaged in arrival order), or RandomStreams draws.
+    """
+    out = np.empty((len(seeds), len(walkin_ids)), dtype=np.int8)
+    ids = [int(pid) for pid in walkin_ids]
+    for r, seed in enumerate(seeds):
+        if crn or antithetic:
+            streams = RandomStreams(seed, antithetic)
+            out[r] = [streams.randint(PRIORITY_STREAM, pid, 1, 5) for pid in ids]
+        else:
+            out[r] = _randint_1_5(random.Random(seed), len(ids))
+    return out
+
+
+def _randint_1_5(rng, count: int):
+    """
+    [rng.randint(1, 5) for _ in range(count)], drawn in bulk: randint(1, 5)
+    takes the top 3 bits of each 32-bit Mersenne Twister output and rejects
+    5-7, and getrandbits(32 * m) returns m outputs as little-endian words.
+    """
+    out = np.empty(0, dtype=np.int8)
+    while len(out) < count:
+        m = (count - len(out)) * 8 // 5 + 16
+        words = np.frombuffer(rng.getrandbits(32 * m).to_bytes(4 * m, "little"), dtype="<u4")
+        top = (words >> 29).astype(np.int8)
+        out = np.concatenate((out, top[top < 5] + 1))
+    return out[:count]  # rng is private to this replication, overdrawing is harmless
+
+
+def run_lockstep(trace: str, seeds, config: SimulationConfig = DEFAULT_CONFIG,
+                 crn: bool = False, antithetic: bool = False, records=None) -> list:
+    """
+    Run one replication per seed in lockstep.
+
+    :param trace: Arrival trace path (ignored when records are given)
+    :param seeds: Triage seeds, one per replication
+    :param config: SimulationConfig (admission_time at least 1, no aging)
+    :param crn: Draw priorities from RandomStreams(seed), as run_replication(crn=True)
+    :param antithetic: Antithetic streams, as run_replication(antithetic=True)
+    :param records: Pre-read (time, type, treatment_time) records
+    :return: run_replication-style summary per seed
+    """
+    if np is None:
+        raise ImportError("the lockstep engine needs NumPy")
+    if config.admission_time < 1:
+        raise ValueError("lockstep engine needs admission_time >= 1")
+    if config.aging_interval > 0:
+        raise ValueError("lockstep engine does not model waiting-room aging")
+    seeds = list(seeds)
+    if records is None:
+        records = read_trace(trace)
+    if not records or not seeds:
+        return [_summarize_empty(seed) for seed in seeds]
+
+    arrivals = np.array([rec[0] for rec in records], dtype=np.int64)
+    if (np.diff(arrivals) < 0).any():
+        raise ValueError("lockstep engine needs arrivals in time order")
+    is_walkin = np.array([rec[1] == 'W' for rec in records])
+    treat = np.array([rec[2] for rec in records], dtype=np.int64)
+    ids = FIRST_PATIENT_ID + np.arange(len(records))
+
+    assess_start, entry = triage_stage(arrivals, is_walkin, config.assessment_time,
+                                       config.triage_nurses)
+    prio = np.ones((len(seeds), len(records)), dtype=np.int8)
+    prio[:, is_walkin] = draw_priorities(ids[is_walkin], seeds, crn, antithetic)
+
+    waits, busy, last_departure = _simulate(prio, is_walkin, entry, treat, config)
+    waits += assess_start - arrivals
+    first_arrival = int(arrivals[0])
+    return [_summarize(seed, prio[r], waits[r], int(busy[r]),
+                       int(last_departure[r]) - first_arrival, config.total_rooms)
+            for r, seed in enumerate(seeds)]
+
+
+class _Buckets:
+    """Pending events by time: time -> [(kind, rows, patients), ...]."""
+    def __init__(self):
+        self._by_time = {}
+        self._times = []
+
+    def add(self, time: int, kind: int, rows, patients) -> None:
+        batch = self._by_time.get(time)
+        if batch is None:
+            batch = self._by_time[time] = []
+            heapq.heappush(self._times, time)
+        batch.append((kind, rows, patients))
+
+    def add_grouped(self, times, kind: int, rows, patients) -> None:
+        """Add events whose times differ, one bucket entry per distinct time."""
+        order = np.argsort(times, kind="stable")
+        times, rows, patients = times[order], rows[order], patients[order]
+        cuts = np.flatnonzero(np.diff(times)) + 1
+        for lo, hi in zip(np.concatenate(([0], cuts)), np.concatenate((cuts, [len(times)]))):
+            self.add(int(times[lo]), kind, rows[lo:hi], patients[lo:hi])
+
+    def next_time(self):
+        return self._times[0] if self._times else None
+
+    def pop(self, time: int) -> list:
+        batch = self._by_time.pop(time, None)
+        if batch is None:
+            return []
+        heapq.heappop(self._times)
+        return batch
+
+
+def _take(batch, kind):
+    rows = [b[1] for b in batch if b[0] == kind]
+    pats = [b[2] for b in batch if b[0] == kind]
+    if not rows:
+        return _EMPTY, _EMPTY
+    return np.concatenate(rows), np.concatenate(pats)
+
+
+def _simulate(prio, is_walkin, entry, treat, config):
+    """
+    Step all replications tick by tick.
+
+    :return: (waits (R, patients) without the triage wait, room busy time
+              per replication, last departure per replication)
+    """
+    R, n = prio.shape
+    rows = np.arange(R)
+    waits = np.zeros((R, n), dtype=np.int64)
+    busy = np.zeros(R, dtype=np.int64)
+    last_departure = np.zeros(R, dtype=np.int64)
+    rooms_free = np.full(R, config.total_rooms, dtype=np.int64)
+
+    # Waiting room. Queue 0: emergencies in id order (same in every
+    # replication). Queues 1-5: walk-ins of that priority, in id order.
+    e_pats = np.flatnonzero(~is_walkin)
+    w_pats = np.flatnonzero(is_walkin)
+    w_prio = prio[:, w_pats]
+    w_order = np.argsort(w_prio, axis=1, kind="stable").astype(np.int64)  # walk-in ordinals
+    counts = np.stack([(w_prio == p).sum(axis=1) for p in range(1, 6)], axis=1)
+    w_end = np.zeros((R, 6), dtype=np.int64)     # end of each priority's run in w_order
+    w_end[:, 1:] = np.cumsum(counts, axis=1)
+    w_start = w_end.copy()
+    w_start[:, 1:] -= counts
+    heads = np.zeros((R, 6), dtype=np.int64)     # served per queue (queue 0: emergencies)
+    heads[:, 1:] = w_start[:, 1:]
+    # Emergencies / walk-ins in the waiting room so far: prefixes in id order
+    e_entry, w_entry = entry[e_pats], entry[w_pats]
+    e_in = w_in = 0
+    entry_times = np.unique(entry)
+    next_entry = 0
+
+    # Admission line per replication, appended in (finish, id) order
+    cap = len(e_pats) + int(counts[:, 0].max(initial=0))
+    line_pat = np.zeros((R, max(cap, 1)), dtype=np.int64)
+    line_finish = np.zeros((R, max(cap, 1)), dtype=np.int64)
+    line_head = np.zeros(R, dtype=np.int64)
+    line_tail = np.zeros(R, dtype=np.int64)
+    nurses_free = np.full(R, config.admission_nurses, dtype=np.int64)
+
+    delay, adm_time = config.departure_delay, config.admission_time
+    buckets = _Buckets()
+    prio_code = np.arange(6) * np.int64(n)  # queue q ranks as priority max(q, 1)
+    prio_code[0] = n
+
+    while True:
+        t = buckets.next_time()
+        if next_entry < len(entry_times) and (t is None or entry_times[next_entry] <= t):
+            t = int(entry_times[next_entry])
+        if t is None:
+            break
+
+        # Waiting-room entries of this tick (same in every replication)
+        entered = next_entry < len(entry_times) and entry_times[next_entry] == t
+        if entered:
+            next_entry += 1
+            e_in = int(np.searchsorted(e_entry, t, "right"))
+            w_in = int(np.searchsorted(w_entry, t, "right"))
+        backfill_rows = rows if entered else _EMPTY
+
+        batch = buckets.pop(t)
+        while True:
+            tc_rows, tc_pats = _take(batch, TREATMENT_DONE)
+            dep_rows, dep_pats = _take(batch, DEPARTURE)
+            adm_rows, adm_pats = _take(batch, ADMISSION_DONE)
+            adm_check = adm_rows
+
+            # Treatment completions: P1 -> admission line, others leave later
+            if len(tc_rows):
+                is_p1 = prio[tc_rows, tc_pats] == 1
+                rr, pp = tc_rows[~is_p1], tc_pats[~is_p1]
+                if delay:
+                    buckets.add(t + delay, DEPARTURE, rr, pp)
+                else:
+                    dep_rows = np.concatenate((dep_rows, rr))
+                    dep_pats = np.concatenate((dep_pats, pp))
+                rr, pp = tc_rows[is_p1], tc_pats[is_p1]
+                if len(rr):
+                    order = np.lexsort((pp, rr))
+                    rr, pp = rr[order], pp[order]
+                    slot = line_tail[rr] + np.arange(len(rr)) - np.searchsorted(rr, rr, "left")
+                    line_pat[rr, slot] = pp
+                    line_finish[rr, slot] = t
+                    np.add.at(line_tail, rr, 1)
+                    adm_check = np.concatenate((adm_check, rr))
+
+            # Admission nurses: a completion frees one, free nurses take
+            # the next P1s now
+            if len(adm_check):
+                np.add.at(nurses_free, adm_rows, 1)
+                rr = np.unique(adm_check)
+                while True:
+                    rr = rr[(nurses_free[rr] > 0) & (line_head[rr] < line_tail[rr])]
+                    if not len(rr):
+                        break
+                    slot = line_head[rr]
+                    pp = line_pat[rr, slot]
+                    waits[rr, pp] += t - line_finish[rr, slot]
+                    line_head[rr] += 1
+                    nurses_free[rr] -= 1
+                    buckets.add(t + adm_time, ADMISSION_DONE, rr, pp)
+                # Admitted patients depart in the same tick
+                dep_rows = np.concatenate((dep_rows, adm_rows))
+                dep_pats = np.concatenate((dep_pats, adm_pats))
+
+            # Departures free rooms
+            if len(dep_rows):
+                np.add.at(rooms_free, dep_rows, 1)
+                np.add.at(busy, dep_rows, t)
+                last_departure[dep_rows] = t
+                if not entered:
+                    backfill_rows = np.concatenate((backfill_rows, dep_rows))
+
+            # End-of-tick backfill in (priority, id) order
+            started_zero = False
+            rr = np.unique(backfill_rows) if len(backfill_rows) else backfill_rows
+            rr = rr[rooms_free[rr] > 0]
+            while len(rr):
+                key = np.full((len(rr), 6), _NONE, dtype=np.int64)
+                h = heads[rr]
+                ok = h[:, 0] < e_in
+                key[ok, 0] = prio_code[0] + e_pats[h[ok, 0]]
+                for q in range(1, 6):
+                    ok = h[:, q] < w_end[rr, q]
+                    ordinal = w_order[rr[ok], h[ok, q]]
+                    ok[ok] = ordinal < w_in
+                    key[ok, q] = prio_code[q] + w_pats[w_order[rr[ok], h[ok, q]]]
+                q = key.argmin(axis=1)
+                best = key[np.arange(len(rr)), q]
+                has = best < _NONE
+                rr, q, best = rr[has], q[has], best[has]
+                if not len(rr):
+                    break
+                pp = best - prio_code[q]
+                heads[rr, q] += 1
+                waits[rr, pp] += t - entry[pp]
+                busy[rr] -= t
+                rooms_free[rr] -= 1
+                finish = t + treat[pp]
+                zero = finish == t
+                if zero.any():
+                    started_zero = True
+                buckets.add_grouped(finish, TREATMENT_DONE, rr, pp)
+                rr = rr[rooms_free[rr] > 0]
+
+            # Zero-length treatments complete within this same tick
+            if not started_zero:
+                break
+            batch = buckets.pop(t)
+            backfill_rows, entered = _EMPTY, False
+
+    return waits, busy, last_departure
+
+
+def _summarize(seed, prio, waits, busy, span, total_rooms):
+    """Same dict as stats.summarize_patients, from one replication's arrays."""
+    summary = {
+        "patients": len(waits),
+        "mean_wait": int(waits.sum()) / len(waits),
+        "room_utilization": (busy / (total_rooms * span)) if span else 0,
+        "by_priority": {},
+    }
+    for p in np.unique(prio).tolist():
+        ws = np.sort(waits[prio == p]).tolist()
+        row = {"count": len(ws), "mean": sum(ws) / len(ws)}
+        for q in SUMMARY_PERCENTILES:
+            row[f"p{q}"] = percentile(ws, q)
+        summary["by_priority"][p] = row
+    summary["seed"] = seed
+    return summary
+
+
+def _summarize_empty(seed):
+    return {"patients": 0, "mean_wait": 0, "room_utilization": 0,
+            "by_priority": {}, "seed": seed}
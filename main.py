@@ -1,48 +1,107 @@
-from arrival_manager import open_input_file, next_arrival_if_due
-from scheduler_queues_rooms import create_all_resources
+from arrival_manager import ArrivalManager, open_input_file, next_arrival_if_due, sample_arrival_times
+from config import DEFAULT_CONFIG, SimulationConfig
+from context import SimulationContext, TRIAGE_RNG_SEED
 from treatment import TreatmentController, set_controller
-from departure import register_backfill_callback
-from events import TreatmentCompleted
-from stats import final_report
-from patient import all_patients_list
-
-def run_simulation(filename: str):
-    # Build fresh shared resources for this run
-    res = create_all_resources()
-    scheduler = res["scheduler"]
-    rooms     = res["rooms"]
-    waiting   = res["waiting_room"]
+from departure import register_backfill_callback, register_departure_sink
+from reporter import Logger, StdoutSink, EVENTS, SUMMARY
+from stats import final_report, utilization_report, blocking_report, RunningSummary
+
+def run_simulation(filename: str, scheduler_backend: str = "heap", source=None,
+                   prefetch: bool = False, streaming: bool = False, row_sink=None,
+                   triage_seed: int = TRIAGE_RNG_SEED, config: SimulationConfig = DEFAULT_CONFIG,
+                   streams=None, logger=None):
+    # Build fresh shared resources for this run; 'auto' picks the scheduler
+    # backend from the first block of the trace, read by the same
+    # ArrivalManager the run then serves arrivals from. `source` (e.g. a
+    # SyntheticArrivalSource) replaces the input file; `prefetch` parses
+    # arrivals on a background thread. `streaming` folds each patient into a
+    # RunningSummary at departure (rows go to `row_sink`) instead of keeping
+    # every patient for the final report, so memory tracks in-flight patients.
+    # All run state lives on the returned SimulationContext, so runs never
+    # leak into each other; `triage_seed` seeds the run's own triage RNG and
+    # `config` sets room count and stage durations; `streams` (RandomStreams)
+    # switches triage to common random numbers. `logger` (reporter.Logger)
+    # takes the event log, by default buffered to stdout; at level SUMMARY
+    # only the end-of-run report is printed, at OFF nothing.
+    fh = sample = None
+    if scheduler_backend == "auto" and source is None:
+        fh = ArrivalManager(filename, prefetch=prefetch)
+        sample = sample_arrival_times(fh)
+    ctx = SimulationContext(scheduler_backend=scheduler_backend, arrival_times=sample,
+                            triage_seed=triage_seed, retain_patients=not streaming,
+                            config=config, streams=streams,
+                            logger=logger or Logger(StdoutSink(buffer_size=1 << 16)))
+    with ctx:
+        try:
+            _run(ctx, filename, source, prefetch, streaming, row_sink, fh)
+        finally:
+            ctx.logger.flush()
+    return ctx
+
+def _run(ctx, filename, source, prefetch, streaming, row_sink, fh):
+    scheduler = ctx.scheduler  # router/admission schedule here too via current()
 
     # Wire treatment controller (C) and give D a backfill hook
-    controller = TreatmentController(rooms, waiting, scheduler)
+    controller = TreatmentController(ctx.rooms, ctx.waiting_room, scheduler)
     set_controller(controller)  # lets events call on_enter_waiting_room(now)
-    register_backfill_callback(controller.try_start_treatment)
+    register_backfill_callback(controller.request_backfill)
+
+    if streaming:
+        ctx.summary = RunningSummary(sink=row_sink)
+        register_departure_sink(ctx.summary.fold)
 
     # Open arrivals and prime exactly one Arrival
-    fh = open_input_file(filename)
-    first = next_arrival_if_due(fh, now=0)
-    if first:
-        scheduler.schedule(first)
+    fh = open_input_file(filename, source=source, prefetch=prefetch, handle=fh)
+    pending = next_arrival_if_due(fh, now=0)
+    if pending:
+        scheduler.schedule(pending)
 
-    # Main event loop
+    # Main event loop, one tick at a time
+    start = now = None
     while not scheduler.is_empty():
-        ev = scheduler.pop_next()
-        now = ev.time
-        ev.process()
+        now = scheduler.peek_time()
+        if start is None:
+            start = now
+
+        # Handle everything due this tick, including events the batch
+        # itself schedules for `now`
+        while scheduler.peek_time() == now:
+            # (TreatmentCompleted routes via the controller; rooms free later on Departure)
+            for ev in scheduler.drain_tick():
+                ev.process()
 
-        # Route treatment completions via controller (rooms free later on Departure)
-        if isinstance(ev, TreatmentCompleted):
-            controller.handle_treatment_completed(ev)
+            # Maintain the “one pending arrival” invariant; the next arrival
+            # may share this tick, so refill before leaving it
+            if pending is not None and pending.time <= now:
+                pending = next_arrival_if_due(fh, now)
+                if pending:
+                    scheduler.schedule(pending)
 
-        # Maintain the “one pending arrival” invariant
-        nxt = next_arrival_if_due(fh, now)
-        if nxt:
-            scheduler.schedule(nxt)
+        # Per-tick bookkeeping: start treatments once rooms/waiting settled
+        controller.run_pending_backfill(now)
 
-    # End-of-run stats
-    final_report(all_patients_list)
+    # End-of-run stats, after the buffered event log
+    ctx.logger.flush()
+    if not ctx.logger.enabled(SUMMARY):
+        return
+    if ctx.summary is not None:
+        ctx.summary.report()
+    else:
+        final_report(ctx.patients)
+    if start is not None:
+        span = now - start
+        admissions = ctx.admission_line
+        utilization_report("Triage nurse", ctx.triage_nurses.utilization(span))
+        utilization_report("Treatment room", ctx.rooms.utilization(span))
+        utilization_report("Admission nurse", admissions.nurses().utilization(span))
+        blocking_report(admissions.blocked_room_time(now), admissions.max_blocked, span)
 
 if __name__ == "__main__":
-    for name in ["data1.txt", "data2.txt", "data3.txt"]:
+    # python main.py [--quiet] [trace ...]; --quiet prints only the reports
+    import sys
+    args = sys.argv[1:]
+    level = SUMMARY if "--quiet" in args else EVENTS
+    names = [a for a in args if a != "--quiet"] or ["data1.txt", "data2.txt", "data3.txt"]
+    for name in names:
         print(f"\n--- Running {name} ---")
-        run_simulation(f"data/{name}")
+        run_simulation(name, logger=Logger(StdoutSink(buffer_size=1 << 16), level))
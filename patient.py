@@ -1,16 +1,27 @@
+from context import current, FIRST_PATIENT_ID
 
-# Global list for all patient objects (used in final reporting)
-all_patients_list = []
+def all_patients():
+    """Patients of the active run (used in final reporting)."""
+    return current().patients
 
 class Patient:
     """
     Represents a patient moving through the emergency room simulation.
+    Slotted: no per-instance __dict__, and wait segments live in fixed
+    fields instead of a per-patient dict.
     """
-    NEXT_ID = 28064212  # Start ID per assignment spec
+    __slots__ = (
+        "id", "arrival_time", "type", "treatment_time",
+        "priority", "treatment_room_id",
+        "assessment_wait_start", "treatment_wait_start", "admission_wait_start",
+        "total_wait_time", "departure_time",
+        "wait_assess", "wait_to_treat", "wait_admit",
+    )
 
     def __init__(self, arrival_time, p_type, treatment_time):
-        self.id = Patient.NEXT_ID
-        Patient.NEXT_ID += 1
+        # Next id of the active run; the run also keeps the patient for the
+        # final report unless it is streaming
+        self.id = current().add_patient(self)
 
         self.arrival_time = arrival_time
         self.type = p_type  # 'E' (Emergency) or 'W' (Walk-in)
@@ -27,10 +38,24 @@ class Patient:
         self.total_wait_time = 0
         self.departure_time = None
 
-        # Automatically register this patient globally
-        all_patients_list.append(self)
+        # Wait segments accumulated by stats.add_wait
+        self.wait_assess = 0
+        self.wait_to_treat = 0
+        self.wait_admit = 0
+
+    @property
+    def waits(self):
+        """Wait segments in the {'assess', 'to_treat', 'admit'} dict shape reports use."""
+        return {"assess": self.wait_assess, "to_treat": self.wait_to_treat,
+                "admit": self.wait_admit}
+
+    @property
+    def treat_time(self):
+        """Alias of treatment_time, the name the treatment controller uses."""
+        return self.treatment_time
 
     def __repr__(self):
         return (f"Patient({self.id}, Type: {self.type}, "
                 f"Priority: {self.priority or 'N/A'}, "
                 f"T_Time: {self.treatment_time})")
+
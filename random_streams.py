@@ -0,0 +1,61 @@
+# random_streams.py
+
+"""
+Common random numbers for comparing configurations.
+
+RandomStreams gives every random quantity its own stream ("priority",
+later durations, ...) and every patient its own draw in that stream: the
+value for (stream, patient id) is a hash of (seed, stream, id), not the
+next number of a shared generator. Two runs with the same seed therefore
+see the same randomness per patient even when a different configuration
+changes the order in which patients are triaged, which is what makes
+paired comparisons sharp. With antithetic=True every uniform u becomes
+1 - u (priority x becomes 6 - x), for antithetic-variate pairs.
+"""
+
+import hashlib
+import math
+
+PRIORITY_STREAM = "priority"
+
+# Uniforms are (k + 0.5) / 2**52 for the top 52 hash bits k. k + 0.5 needs
+# 53 bits, so every value and its antithetic 1 - u is exact and strictly
+# inside (0, 1); with 53 or more bits the largest k rounds up to 1.0.
+_UNIFORM_BITS = 52
+_SCALE = 1.0 / (1 << _UNIFORM_BITS)
+
+
+def _unit(digest: bytes) -> float:
+    """Map an 8-byte hash to a uniform in (0, 1)."""
+    return ((int.from_bytes(digest, "little") >> (64 - _UNIFORM_BITS)) + 0.5) * _SCALE
+
+
+class RandomStreams:
+    """
+    Counter-based random streams: draws depend only on (seed, stream,
+    index), so they need no state and can be taken in any order.
+
+    :param seed: Seed shared by paired runs
+    :param antithetic: Use 1 - u for every uniform u
+    """
+    def __init__(self, seed: int, antithetic: bool = False):
+        self.seed = seed
+        self.antithetic = antithetic
+        self._prefix = {}
+
+    def uniform(self, stream: str, index: int) -> float:
+        """Uniform in (0, 1) for draw `index` (e.g. a patient id) of `stream`."""
+        prefix = self._prefix.get(stream)
+        if prefix is None:
+            prefix = self._prefix[stream] = f"{self.seed}:{stream}:".encode()
+        h = hashlib.blake2b(prefix + str(index).encode(), digest_size=8).digest()
+        u = _unit(h)
+        return 1.0 - u if self.antithetic else u
+
+    def randint(self, stream: str, index: int, low: int, high: int) -> int:
+        """Integer in [low, high]; the antithetic of low + k is high - k."""
+        return low + int(self.uniform(stream, index) * (high - low + 1))
+
+    def expovariate(self, stream: str, index: int, mean: float) -> float:
+        """Exponential with the given mean (inverse transform, so antithetic-safe)."""
+        return -mean * math.log(self.uniform(stream, index))
@@ -0,0 +1,217 @@
+# replications.py
+
+"""
+Independent replications of run_simulation over a process pool.
+
+Each replication gets its own SimulationContext and triage seed, runs with
+its event log discarded, and sends back only the compact summary from
+stats.summarize_patients. The runner then reports t-based confidence
+intervals across replications.
+
+compare_configs pairs two configurations on common random numbers (and
+optionally antithetic twins) and reports the paired-difference estimate.
+
+    python replications.py data1.txt 32 [workers]
+"""
+
+import math
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from config import DEFAULT_CONFIG, SimulationConfig
+from context import TRIAGE_RNG_SEED
+from main import run_simulation
+from random_streams import RandomStreams
+from reporter import Logger, NullSink
+from stats import (confidence_interval, sample_variance, summarize_patients, t_quantile,
+                   SUMMARY_PERCENTILES)
+
+
+def replication_seeds(n: int, base_seed: int = TRIAGE_RNG_SEED) -> list:
+    """Seeds for n replications; the first is the deterministic default run."""
+    return [base_seed + i for i in range(n)]
+
+
+def run_replication(trace: str, seed: int, scheduler_backend: str = "heap",
+                    config: SimulationConfig = DEFAULT_CONFIG, crn: bool = False,
+                    antithetic: bool = False) -> dict:
+    """
+    One replication with its event log and report discarded (a NullSink
+    logger, so no event line is even formatted).
+
+    :param crn: Draw priorities from RandomStreams(seed) (common random
+                numbers) instead of the sequential triage RNG
+    :param antithetic: With crn, use the antithetic streams
+    :return: summarize_patients() dict plus the seed
+    """
+    streams = RandomStreams(seed, antithetic) if crn or antithetic else None
+    ctx = run_simulation(trace, scheduler_backend=scheduler_backend, triage_seed=seed,
+                         config=config, streams=streams, logger=Logger(NullSink()))
+    summary = summarize_patients(ctx.patients, config.total_rooms)
+    summary["seed"] = seed
+    return summary
+
+
+def _run_batch(args):
+    trace, seeds, scheduler_backend, config = args
+    return [run_replication(trace, seed, scheduler_backend, config) for seed in seeds]
+
+
+def run_replications(trace: str, n: int = None, seeds=None, workers: int = None,
+                     level: float = 0.95, scheduler_backend: str = "heap",
+                     config: SimulationConfig = DEFAULT_CONFIG, engine: str = "events") -> dict:
+    """
+    Run independent replications of `trace` and aggregate them.
+
+    :param trace: Arrival trace path (any format open_arrival_source reads)
+    :param n: Number of replications (seeds default to replication_seeds(n))
+    :param seeds: Explicit triage seeds, one per replication
+    :param workers: Worker processes (default os.cpu_count(); 1 runs in-process)
+    :param level: Confidence level of the reported intervals
+    :param scheduler_backend: Scheduler backend name (see create_scheduler)
+    :param config: SimulationConfig shared by all replications
+    :param engine: "events" (run_simulation per seed) or "lockstep" (all
+                   seeds at once on one core, see lockstep.py; needs NumPy)
+    :return: {"replications": [summary, ...], "level": level,
+              "mean_wait": (mean, half_width), "room_utilization": (mean, half_width),
+              "by_priority": {priority: {"mean": (mean, half_width), "p90": ...}}}
+    """
+    if seeds is None:
+        if n is None:
+            raise ValueError("give n or seeds")
+        seeds = replication_seeds(n)
+    seeds = list(seeds)
+    workers = min(workers or os.cpu_count() or 1, len(seeds)) or 1
+
+    if engine == "lockstep":
+        from lockstep import run_lockstep
+        summaries = run_lockstep(trace, seeds, config)
+    elif engine != "events":
+        raise ValueError(f"unknown engine: {engine!r}")
+    elif workers == 1:
+        summaries = _run_batch((trace, seeds, scheduler_backend, config))
+    else:
+        # A few batches per worker: little pickling overhead, still balanced
+        size = max(1, len(seeds) // (workers * 4))
+        batches = [(trace, seeds[i:i + size], scheduler_backend, config)
+                   for i in range(0, len(seeds), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            summaries = [s for batch in pool.map(_run_batch, batches) for s in batch]
+
+    return aggregate_replications(summaries, level)
+
+
+def aggregate_replications(summaries: list, level: float = 0.95) -> dict:
+    """Confidence intervals across replication summaries (see run_replications)."""
+    report = {
+        "replications": summaries,
+        "level": level,
+        "mean_wait": confidence_interval([s["mean_wait"] for s in summaries], level),
+        "room_utilization": confidence_interval(
+            [s["room_utilization"] for s in summaries], level),
+        "by_priority": {},
+    }
+    priorities = {prio for s in summaries for prio in s["by_priority"]}
+    for prio in sorted(priorities, key=lambda k: (k is None, k)):
+        rows = [s["by_priority"][prio] for s in summaries if prio in s["by_priority"]]
+        stats = {"replications": len(rows)}
+        for field in ["mean"] + [f"p{q}" for q in SUMMARY_PERCENTILES]:
+            stats[field] = confidence_interval([r[field] for r in rows], level)
+        report["by_priority"][prio] = stats
+    return report
+
+
+# PAIRED COMPARISONS
+# ============================================================================
+
+def _run_pair(args):
+    trace, seed, config_a, config_b, antithetic, metric, scheduler_backend = args
+    values = []
+    for config in (config_a, config_b):
+        value = run_replication(trace, seed, scheduler_backend, config, crn=True)[metric]
+        if antithetic:
+            twin = run_replication(trace, seed, scheduler_backend, config, antithetic=True)
+            value = (value + twin[metric]) / 2
+        values.append(value)
+    return tuple(values)
+
+
+def compare_configs(trace: str, config_a: SimulationConfig, config_b: SimulationConfig,
+                    n: int = None, seeds=None, workers: int = None, level: float = 0.95,
+                    antithetic: bool = False, metric: str = "mean_wait",
+                    scheduler_backend: str = "heap") -> dict:
+    """
+    Compare two configurations on common random numbers: for every seed both
+    run on the same RandomStreams, so the per-seed difference b - a carries
+    little noise. With antithetic=True each value is the average of a run
+    and its antithetic twin.
+
+    :param metric: Scalar key of the replication summary to compare
+    :return: {"pairs": [(a, b), ...], "level": level, "metric": metric,
+              "a": (mean, hw), "b": (mean, hw), "difference": (mean, hw),
+              "independent_half_width": hw an unpaired comparison would have}
+    """
+    if seeds is None:
+        if n is None:
+            raise ValueError("give n or seeds")
+        seeds = replication_seeds(n)
+    jobs = [(trace, seed, config_a, config_b, antithetic, metric, scheduler_backend)
+            for seed in seeds]
+    workers = min(workers or os.cpu_count() or 1, len(jobs)) or 1
+    if workers == 1:
+        pairs = [_run_pair(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pairs = list(pool.map(_run_pair, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    return paired_difference(pairs, level, metric)
+
+
+def paired_difference(pairs: list, level: float = 0.95, metric: str = "mean_wait") -> dict:
+    """Paired-difference estimator over (a, b) values (see compare_configs)."""
+    a = [x for x, _ in pairs]
+    b = [y for _, y in pairs]
+    n = len(pairs)
+    independent = math.inf
+    if n > 1:
+        independent = t_quantile(0.5 + level / 2, 2 * n - 2) * math.sqrt(
+            (sample_variance(a) + sample_variance(b)) / n)
+    return {
+        "pairs": pairs,
+        "level": level,
+        "metric": metric,
+        "a": confidence_interval(a, level),
+        "b": confidence_interval(b, level),
+        "difference": confidence_interval([y - x for x, y in pairs], level),
+        "independent_half_width": independent,
+    }
+
+
+def print_comparison(report: dict) -> None:
+    pct = int(round(report["level"] * 100))
+    print(f"\nPaired comparison of {report['metric']}: {len(report['pairs'])} pairs "
+          f"({pct}% confidence intervals)")
+    for name in ("a", "b", "difference"):
+        mean, hw = report[name]
+        print(f"{name}: {mean:.3f} ± {hw:.3f}")
+    print(f"(unpaired runs would give ± {report['independent_half_width']:.3f})")
+
+
+def print_replication_report(report: dict) -> None:
+    pct = int(round(report["level"] * 100))
+    print(f"\nReplications: {len(report['replications'])} ({pct}% confidence intervals)")
+    mean, hw = report["mean_wait"]
+    print(f"Average wait: {mean:.2f} ± {hw:.2f}")
+    mean, hw = report["room_utilization"]
+    print(f"Room utilization: {mean:.3f} ± {hw:.3f}")
+    for prio, stats in report["by_priority"].items():
+        cells = ", ".join(f"{field} {stats[field][0]:.2f} ± {stats[field][1]:.2f}"
+                          for field in ["mean"] + [f"p{q}" for q in SUMMARY_PERCENTILES])
+        print(f"Priority {prio} ({stats['replications']} reps): {cells}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("usage: python replications.py TRACE N [WORKERS]")
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    print_replication_report(run_replications(sys.argv[1], int(sys.argv[2]), workers=workers))
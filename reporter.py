@@ -1,23 +1,150 @@
+import sys
+
+from context import current
+
+# LOG LEVELS AND SINKS
+# ============================================================================
+# Event lines go through the active run's Logger (SimulationContext.logger)
+# instead of print. Every log_* function checks logger.events before it
+# builds its f-string, so with events off (e.g. main.py --quiet) no string
+# is formatted per event. Sinks batch lines and write them in large chunks.
+
+EVENTS = 10    # one line per simulation event
+SUMMARY = 20   # end-of-run reports only
+OFF = 100      # nothing
+
+class NullSink:
+    """Discards everything; a Logger on it is always OFF."""
+    def write(self, line: str) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class BufferedSink:
+    """
+    Collects lines and hands them to `write` joined into one string once
+    `buffer_size` characters have piled up (0: every line right away).
+    """
+    def __init__(self, write, buffer_size: int = 1 << 16):
+        self._write = write
+        self.buffer_size = buffer_size
+        self._lines = []
+        self._size = 0
+
+    def write(self, line: str) -> None:
+        self._lines.append(line)
+        self._size += len(line) + 1
+        if self._size >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._lines:
+            self._lines.append("")
+            self._write("\n".join(self._lines))
+            self._lines = []
+            self._size = 0
+
+    def close(self) -> None:
+        self.flush()
+
+class StdoutSink(BufferedSink):
+    """Writes to whatever sys.stdout is at flush time (so redirects apply)."""
+    def __init__(self, buffer_size: int = 0):
+        super().__init__(lambda text: sys.stdout.write(text), buffer_size)
+
+class FileSink(BufferedSink):
+    """Buffered writes to a text file, opened on creation and closed by close()."""
+    def __init__(self, path: str, buffer_size: int = 1 << 20):
+        self._file = open(path, "w", encoding="utf-8")
+        super().__init__(self._file.write, buffer_size)
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+class Logger:
+    """
+    Level filter in front of a sink. `events` is the flag the per-event
+    log_* functions test before formatting anything.
+
+    :param sink: NullSink, StdoutSink (default, unbuffered) or FileSink
+    :param level: EVENTS, SUMMARY or OFF
+    """
+    def __init__(self, sink=None, level: int = EVENTS):
+        self.sink = StdoutSink() if sink is None else sink
+        self.level = OFF if isinstance(self.sink, NullSink) else level
+        self.events = self.level <= EVENTS
+
+    def enabled(self, level: int) -> bool:
+        return self.level <= level
+
+    def write(self, line: str) -> None:
+        self.sink.write(line)
+
+    def flush(self) -> None:
+        self.sink.flush()
+
+    def close(self) -> None:
+        self.sink.close()
+
+
+# EVENT LINES
+# ============================================================================
+
+def log_arrival(p, t) -> None:
+    log = current().logger
+    if log.events:
+        kind = "Emergency" if p.type == 'E' else "Walk-In"
+        log.write(f"Time {t}: {p.id} ({kind}) arrives")
+
+def log_assessment_start(p, t, waited) -> None:
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} starts assessment (waited {waited})")
+
+def log_assessment_done(p, t) -> None:
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} assessment completed (Priority now {p.priority})")
+
+def log_enter_waiting_room(p, t) -> None:
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} (Priority {p.priority}) enters waiting room")
+
 def log_start(p, t, rooms_avail) -> None:
     # Part C calls this; kept here for centralized formatting
-    print(f"Time {t}: {p.id} (Priority {p.priority}) starts treatment "
-          f"({rooms_avail} rooms still available)")
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} (Priority {p.priority}) starts treatment "
+                  f"({rooms_avail} rooms still available)")
 
 def log_treatment_completed(p, t) -> None:
     # Part C calls this on completion (before routing)
-    print(f"Time {t}: {p.id} (Priority {p.priority}) finishes treatment")
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} (Priority {p.priority}) finishes treatment")
 
 def log_admission_complete(p, t) -> None:
     # Print admission at completion time only (P1)
-    print(f"Time {t}: {p.id} (Priority 1) admitted to Hospital")
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} (Priority 1) admitted to Hospital")
 
 def log_departure(p, t, rooms_avail) -> None:
-    print(f"Time {t}: {p.id} (Priority {p.priority}) departs "
-          f"({rooms_avail} rooms still available)")
+    log = current().logger
+    if log.events:
+        log.write(f"Time {t}: {p.id} (Priority {p.priority}) departs "
+                  f"({rooms_avail} rooms still available)")
 
 def note_wait_segment(p, key: str, delta: int) -> None:
     # Optional accumulator for waits: 'assess', 'to_treat', 'admit'
-    p.waits[key] = p.waits.get(key, 0) + delta
+    from stats import add_wait
+    add_wait(p, key, delta)
 
 def final_report(patients: list) -> None:
     print("\nPatient Wait Summary")
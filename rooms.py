@@ -1,12 +1,14 @@
-from scheduler_queues_rooms import create_all_resources
-_resources = create_all_resources()
-_rooms = _resources["rooms"]
+from context import current
 
-def acquire_if_available(): return _rooms.acquire_if_available()
-def release():              _rooms.release()
-def available_count():      return _rooms.get_available_count()
+# Treatment rooms of the active SimulationContext
+
+def acquire_if_available(): return current().rooms.acquire_if_available()
+def acquire():              return current().rooms.acquire()
+def release(room_id=None):  current().rooms.release(room_id)
+def available_count():      return current().rooms.get_available_count()
 
 def reset(n=3):
     # soft reset for tests/demos
-    _rooms._total = n
-    _rooms._occupied = 0
+    from scheduler_queues_rooms import create_rooms_manager
+    ctx = current()
+    ctx.rooms = create_rooms_manager(n, waiting_room=ctx.waiting_room)
@@ -1,10 +1,12 @@
+from context import current
 from scheduler import schedule
 from departure import Departure
 from admission import admission_enqueue, try_start_admission
 
 def route_after_treatment(patient, now):
     if patient.priority == 1:
+        patient.admission_wait_start = now
         admission_enqueue(patient, now)
         try_start_admission(now)
     else:
-        schedule(Departure(now + 1, patient))
+        schedule(Departure(now + current().config.departure_delay, patient))
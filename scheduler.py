@@ -1,10 +1,19 @@
-from scheduler_queues_rooms import create_all_resources
+from context import current
+from scheduler_queues_rooms import create_scheduler
 
-# Create shared singletons from your existing factory
-_resources = create_all_resources()
-_sched = _resources["scheduler"]
+# Shared scheduler used by router/admission/departure: the active
+# SimulationContext's, so every module schedules into the run's queue
 
-def schedule(ev): _sched.schedule(ev)
-def pop_next():   return _sched.pop_next()
-def peek():       return _sched.peek()
-def empty():      return _sched.is_empty()
+def use_scheduler(sched):
+    """Route schedule()/pop_next()/... to `sched` (any scheduler backend)."""
+    current().scheduler = sched
+    return sched
+
+def configure(backend="heap", arrival_times=None):
+    """Install a fresh scheduler of the given backend (see create_scheduler)."""
+    return use_scheduler(create_scheduler(backend, arrival_times))
+
+def schedule(ev): return current().scheduler.schedule(ev)
+def pop_next():   return current().scheduler.pop_next()
+def peek():       return current().scheduler.peek()
+def empty():      return current().scheduler.is_empty()
@@ -1,5 +1,8 @@
 from typing import Optional, List, Any
+import abc
+import bisect
 import heapq
+from collections import deque
 
 
 # Scheduler singleton
@@ -25,9 +28,236 @@ def rooms_instance():
     return _ROOMS_SINGLETON
 
 
+# PACKED SORT KEYS
+# ============================================================================
+# Every scheduler entry is a single int laid out as
+#   time | priority (10 bits) | patient id (40 bits) | counter (40 bits)
+# so heap comparisons are one int compare instead of a tuple walk, and the
+# heap stores plain ints. The counter doubles as the lookup key for the event.
+
+NO_PRIORITY = 999  # Used for events whose patient has not been assessed yet
+
+_PRIORITY_BITS = 10
+_ID_BITS = 40
+_COUNTER_BITS = 40
+_ID_SHIFT = _COUNTER_BITS
+_PRIORITY_SHIFT = _ID_SHIFT + _ID_BITS
+_TIME_SHIFT = _PRIORITY_SHIFT + _PRIORITY_BITS
+_PRIORITY_LIMIT = 1 << _PRIORITY_BITS
+_ID_LIMIT = 1 << _ID_BITS
+_COUNTER_MASK = (1 << _COUNTER_BITS) - 1
+
+
+def pack_sort_key(time: int, priority: Optional[int], patient_id: int, counter: int) -> int:
+    """
+    Pack (time, priority, patient_id, counter) into one int that sorts the
+    same way as the tuple.
+
+    :param priority: Patient priority, or None for NO_PRIORITY
+    :return: Packed key
+    """
+    if priority is None:
+        priority = NO_PRIORITY
+    if not 0 <= priority < _PRIORITY_LIMIT:
+        raise ValueError(f"priority {priority} does not fit in a packed key")
+    if not 0 <= patient_id < _ID_LIMIT:
+        raise ValueError(f"patient id {patient_id} does not fit in a packed key")
+    return (((((time << _PRIORITY_BITS) | priority) << _ID_BITS) | patient_id)
+            << _COUNTER_BITS) | (counter & _COUNTER_MASK)
+
+
+def unpack_sort_key(key: int) -> tuple:
+    """Inverse of pack_sort_key: return (time, priority, patient_id, counter)"""
+    return (key >> _TIME_SHIFT,
+            (key >> _PRIORITY_SHIFT) & (_PRIORITY_LIMIT - 1),
+            (key >> _ID_SHIFT) & (_ID_LIMIT - 1),
+            key & _COUNTER_MASK)
+
+
+def _event_key(event, counter: int) -> int:
+    """Packed key for an event with .time and .patient"""
+    patient = event.patient
+    return pack_sort_key(event.time, patient.priority, patient.id, counter)
+
+
+# SHARED SCHEDULER BOOKKEEPING
+# ============================================================================
+
+class _SchedulerBase(abc.ABC):
+    """
+    Event storage shared by the scheduler backends.
+
+    Every backend offers schedule, schedule_many, pop_next, peek, peek_time,
+    pop_all_at, drain_tick, cancel, reschedule, size and is_empty. Pending
+    events live in a counter -> event dict; the backend only orders
+    packed keys. Cancelling drops the event from the dict and leaves its key
+    behind as a tombstone that pops and peeks skip. Once tombstones outnumber
+    live events the backend rebuilds itself without them.
+    """
+
+    COMPACT_MIN_DEAD = 64  # Never compact for fewer tombstones than this
+
+    def __init__(self):
+        self._events = {}   # counter -> event (live events only)
+        self._counter = 0   # Tie-breaker for insertion order
+        self._dead = 0      # Tombstoned keys still stored by the backend
+
+    def _next_key(self, event) -> int:
+        """Register an event and return its packed key"""
+        counter = self._counter
+        # Pack first: an event whose key does not fit must leave no trace
+        key = _event_key(event, counter)
+        self._counter = counter + 1
+        self._events[counter] = event
+        return key
+
+    def _next_keys(self, events) -> List[int]:
+        """Register a batch of events in one pass and return their packed keys"""
+        events = list(events)
+        start = self._counter
+        # Pack the whole batch first, so a bad event rejects it untouched
+        keys = [_event_key(event, start + i) for i, event in enumerate(events)]
+        self._counter = start + len(events)
+        self._events.update(zip(range(start, self._counter), events))
+        return keys
+
+    def schedule_many(self, events) -> List[int]:
+        """
+        Schedule a batch of events (a preloaded day of arrivals, a restored
+        queue, ...). Counters follow iteration order, so ties come out exactly
+        as if schedule() had been called once per event.
+
+        :param events: Iterable of Event objects
+        :return: Handles, in input order
+        """
+        keys = self._next_keys(events)
+        self._push_many(keys)
+        return [key & _COUNTER_MASK for key in keys]
+
+    @abc.abstractmethod
+    def _push_many(self, keys: List[int]):
+        """Insert already-registered packed keys into the backend"""
+
+    def cancel(self, handle: int) -> bool:
+        """
+        Cancel a scheduled event in O(1).
+
+        :param handle: Value returned by schedule()
+        :return: True if the event was pending, False if already popped/cancelled
+        """
+        if self._events.pop(handle, None) is None:
+            return False
+        self._dead += 1
+        if self._dead >= self.COMPACT_MIN_DEAD and self._dead > len(self._events):
+            self._compact()
+            self._dead = 0
+        return True
+
+    def reschedule(self, handle: int, time: int) -> Optional[int]:
+        """
+        Move a pending event to a new time.
+
+        :param handle: Value returned by schedule()
+        :param time: New event time
+        :return: New handle, or None if the event was no longer pending
+        """
+        event = self._events.get(handle)
+        if event is None:
+            return None
+        self.cancel(handle)
+        event.time = time
+        return self.schedule(event)
+
+    @abc.abstractmethod
+    def _compact(self):
+        """Drop every tombstoned key from the backend"""
+
+    def is_empty(self) -> bool:
+        """Check if the event queue is empty"""
+        return not self._events
+
+    def size(self) -> int:
+        """Get number of live (not cancelled) events in queue"""
+        return len(self._events)
+
+    def drain_tick(self) -> List[Any]:
+        """
+        Remove and return every event at the earliest pending time.
+
+        Events scheduled for that same time while the batch is being handled
+        are returned by the next drain_tick() call.
+
+        :return: List of events (empty if the queue is empty)
+        """
+        time = self.peek_time()
+        if time is None:
+            return []
+        return self.pop_all_at(time)
+
+    # Generic ordering on top of _top_key()/_pop_key(). Backends with a
+    # faster direct path override these.
+
+    @abc.abstractmethod
+    def _top_key(self) -> Optional[int]:
+        """Smallest stored key (live or tombstoned), or None"""
+
+    @abc.abstractmethod
+    def _pop_key(self):
+        """Remove the smallest stored key"""
+
+    def _top_live_key(self) -> Optional[int]:
+        """Smallest live key, discarding tombstones on the way"""
+        events = self._events
+        key = self._top_key()
+        while key is not None and (key & _COUNTER_MASK) not in events:
+            self._pop_key()
+            self._dead -= 1
+            key = self._top_key()
+        return key
+
+    def pop_next(self) -> Optional[Any]:
+        """
+        Remove and return the next event to process.
+
+        :return: Next Event object, or None if queue is empty
+        """
+        key = self._top_live_key()
+        if key is None:
+            return None
+        self._pop_key()
+        return self._events.pop(key & _COUNTER_MASK)
+
+    def peek(self) -> Optional[Any]:
+        """Look at the next event without removing it"""
+        key = self._top_live_key()
+        return None if key is None else self._events[key & _COUNTER_MASK]
+
+    def peek_time(self) -> Optional[int]:
+        """Time of the next event, or None if the queue is empty"""
+        key = self._top_live_key()
+        return None if key is None else key >> _TIME_SHIFT
+
+    def pop_all_at(self, time: int) -> List[Any]:
+        """
+        Remove and return every event due at or before `time`.
+
+        :param time: Simulation time
+        :return: Events in the same order repeated pop_next() calls would give
+        """
+        limit = (time + 1) << _TIME_SHIFT
+        events = self._events
+        batch = []
+        key = self._top_live_key()
+        while key is not None and key < limit:
+            self._pop_key()
+            batch.append(events.pop(key & _COUNTER_MASK))
+            key = self._top_live_key()
+        return batch
+
+
 # EVENT SCHEDULER
 
-class EventScheduler:
+class EventScheduler(_SchedulerBase):
     """
     Global event queue ordered by:
     1. Time (ascending)
@@ -36,10 +266,10 @@ class EventScheduler:
     """
     
     def __init__(self):
-        self._heap = []
-        self._counter = 0  # Tie-breaker for insertion order
+        super().__init__()
+        self._heap = []     # Packed int keys
     
-    def schedule(self, event):
+    def schedule(self, event) -> int:
         """
         Schedule an event to be processed.
         
@@ -49,17 +279,42 @@ class EventScheduler:
         - patient.id (tertiary)
         
         :param event: Event object with .time and .patient attributes
+        :return: Handle for cancel()/reschedule()
         """
-        # Create sort key: (time, priority, patient_id, counter)
+        # Sort key packs (time, priority, patient_id, counter) into one int
         # Priority: Use 999 if None (for events without assessed patients)
-        priority = event.patient.priority if event.patient.priority is not None else 999
-        patient_id = event.patient.id
-        
-        # Use counter to maintain stable sort for truly identical events
-        sort_key = (event.time, priority, patient_id, self._counter)
-        self._counter += 1
-        
-        heapq.heappush(self._heap, (sort_key, event))
+        # Counter keeps a stable sort for truly identical events
+        key = self._next_key(event)
+        heapq.heappush(self._heap, key)
+        return key & _COUNTER_MASK
+    
+    def _push_many(self, keys: List[int]):
+        heap = self._heap
+        if len(keys) * 4 >= len(heap):
+            # Rebuilding is O(n + k), cheaper than k pushes once k is large
+            heap.extend(keys)
+            heapq.heapify(heap)
+        else:
+            for key in keys:
+                heapq.heappush(heap, key)
+    
+    def _skip_dead(self):
+        """Pop tombstones off the top of the heap"""
+        heap, events = self._heap, self._events
+        while heap and (heap[0] & _COUNTER_MASK) not in events:
+            heapq.heappop(heap)
+            self._dead -= 1
+    
+    def _compact(self):
+        events = self._events
+        self._heap = [key for key in self._heap if (key & _COUNTER_MASK) in events]
+        heapq.heapify(self._heap)
+    
+    def _top_key(self) -> Optional[int]:
+        return self._heap[0] if self._heap else None
+    
+    def _pop_key(self):
+        heapq.heappop(self._heap)
     
     def pop_next(self) -> Optional[Any]:
         """
@@ -67,24 +322,623 @@ class EventScheduler:
         
         :return: Next Event object, or None if queue is empty
         """
+        self._skip_dead()
         if self._heap:
-            _, event = heapq.heappop(self._heap)
-            return event
+            return self._events.pop(heapq.heappop(self._heap) & _COUNTER_MASK)
         return None
     
-    def is_empty(self) -> bool:
-        """Check if the event queue is empty"""
-        return len(self._heap) == 0
+    def peek(self) -> Optional[Any]:
+        """Look at the next event without removing it"""
+        self._skip_dead()
+        if self._heap:
+            return self._events[self._heap[0] & _COUNTER_MASK]
+        return None
+    
+    def peek_time(self) -> Optional[int]:
+        """Time of the next event, or None if the queue is empty"""
+        self._skip_dead()
+        if self._heap:
+            return self._heap[0] >> _TIME_SHIFT
+        return None
     
+    def pop_all_at(self, time: int) -> List[Any]:
+        """
+        Remove and return every event due at or before `time`.
+        
+        :param time: Simulation time
+        :return: Events in the same order repeated pop_next() calls would give
+        """
+        heap, events = self._heap, self._events
+        limit = (time + 1) << _TIME_SHIFT
+        batch = []
+        while heap and heap[0] < limit:
+            event = events.pop(heapq.heappop(heap) & _COUNTER_MASK, None)
+            if event is None:
+                self._dead -= 1
+            else:
+                batch.append(event)
+        return batch
+
+
+# CALENDAR QUEUE SCHEDULER (timing wheel)
+# ============================================================================
+
+class CalendarScheduler(_SchedulerBase):
+    """
+    Event queue with the same ordering contract as EventScheduler, backed by
+    a timing wheel instead of a single binary heap.
+
+    Simulation times are small non-negative integers, so every tick in the
+    window [base, base + wheel_size) owns one bucket. A bucket only holds
+    events for one time, so it is ordered by (priority, patient_id, counter)
+    and normally stays tiny. Events past the window wait in an overflow heap
+    and move into the wheel as the window advances. Schedule and pop are
+    amortized O(1) when most events land inside the window.
+    """
+
+    DEFAULT_WHEEL_SIZE = 1024
+
+    def __init__(self, wheel_size: int = DEFAULT_WHEEL_SIZE):
+        if wheel_size < 1:
+            raise ValueError("wheel_size must be at least 1")
+        super().__init__()
+        self._wheel_size = wheel_size
+        self._wheel: List[list] = [[] for _ in range(wheel_size)]
+        self._base = 0            # time held by the cursor bucket
+        self._in_wheel = 0        # keys currently stored in the wheel
+        self._overflow = []       # heap of packed keys beyond the window
+        self._early = []          # heap of packed keys scheduled before base
+
+    def schedule(self, event) -> int:
+        """
+        Schedule an event to be processed.
+
+        Same ordering as EventScheduler.schedule (time, priority, patient id,
+        insertion order).
+
+        :param event: Event object with .time and .patient attributes
+        :return: Handle for cancel()/reschedule()
+        """
+        key = self._next_key(event)
+        t = event.time
+        if t < self._base:
+            # Earlier than anything the wheel can hold; always served first
+            heapq.heappush(self._early, key)
+        elif t - self._base < self._wheel_size:
+            heapq.heappush(self._wheel[t % self._wheel_size], key)
+            self._in_wheel += 1
+        else:
+            heapq.heappush(self._overflow, key)
+        return key & _COUNTER_MASK
+
+    def _push_many(self, keys: List[int]):
+        base, size, wheel = self._base, self._wheel_size, self._wheel
+        touched = set()
+        early, overflow = [], []
+        for key in keys:
+            t = key >> _TIME_SHIFT
+            if t < base:
+                early.append(key)
+            elif t - base < size:
+                slot = t % size
+                wheel[slot].append(key)
+                touched.add(slot)
+            else:
+                overflow.append(key)
+        # Restore the heap property once per touched bucket, not per key
+        for slot in touched:
+            heapq.heapify(wheel[slot])
+        self._in_wheel += len(keys) - len(early) - len(overflow)
+        if early:
+            self._early.extend(early)
+            heapq.heapify(self._early)
+        if overflow:
+            self._overflow.extend(overflow)
+            heapq.heapify(self._overflow)
+
+    def _compact(self):
+        events = self._events
+
+        def live(keys):
+            return [key for key in keys if (key & _COUNTER_MASK) in events]
+
+        self._in_wheel = 0
+        for bucket in self._wheel:
+            if bucket:
+                bucket[:] = live(bucket)
+                heapq.heapify(bucket)
+                self._in_wheel += len(bucket)
+        self._overflow = live(self._overflow)
+        heapq.heapify(self._overflow)
+        self._early = live(self._early)
+        heapq.heapify(self._early)
+
+    def _refill(self):
+        """Move overflow events that now fall inside the window into the wheel."""
+        limit = (self._base + self._wheel_size) << _TIME_SHIFT
+        overflow = self._overflow
+        while overflow and overflow[0] < limit:
+            key = heapq.heappop(overflow)
+            heapq.heappush(self._wheel[(key >> _TIME_SHIFT) % self._wheel_size], key)
+            self._in_wheel += 1
+
+    def _current_bucket(self) -> Optional[list]:
+        """
+        Advance the cursor to the first bucket holding a live event and
+        return it, with any tombstones on top already removed.
+
+        :return: Bucket list, or None if the wheel and overflow are empty
+        """
+        events = self._events
+        wheel, size = self._wheel, self._wheel_size
+        while True:
+            if self._in_wheel == 0:
+                if not self._overflow:
+                    return None
+                # Nothing inside the window: jump straight to the next event
+                self._base = self._overflow[0] >> _TIME_SHIFT
+                self._refill()
+            bucket = wheel[self._base % size]
+            while not bucket:
+                self._base += 1
+                if self._overflow:
+                    self._refill()
+                bucket = wheel[self._base % size]
+            while bucket and (bucket[0] & _COUNTER_MASK) not in events:
+                heapq.heappop(bucket)
+                self._in_wheel -= 1
+                self._dead -= 1
+            if bucket:
+                return bucket
+
+    def _early_top(self) -> Optional[int]:
+        """Smallest live key scheduled behind the cursor, if any"""
+        early, events = self._early, self._events
+        while early and (early[0] & _COUNTER_MASK) not in events:
+            heapq.heappop(early)
+            self._dead -= 1
+        return early[0] if early else None
+
+    def _top_key(self) -> Optional[int]:
+        key = self._early_top()
+        if key is None:
+            bucket = self._current_bucket()
+            key = bucket[0] if bucket else None
+        return key
+
+    def _pop_key(self):
+        if self._early_top() is not None:
+            heapq.heappop(self._early)
+        else:
+            heapq.heappop(self._current_bucket())
+            self._in_wheel -= 1
+
+    def pop_next(self) -> Optional[Any]:
+        """
+        Remove and return the next event to process.
+
+        :return: Next Event object, or None if queue is empty
+        """
+        if self._early_top() is not None:
+            return self._events.pop(heapq.heappop(self._early) & _COUNTER_MASK)
+        bucket = self._current_bucket()
+        if bucket is None:
+            return None
+        self._in_wheel -= 1
+        return self._events.pop(heapq.heappop(bucket) & _COUNTER_MASK)
+
     def peek(self) -> Optional[Any]:
         """Look at the next event without removing it"""
+        key = self._early_top()
+        if key is None:
+            bucket = self._current_bucket()
+            if bucket is None:
+                return None
+            key = bucket[0]
+        return self._events[key & _COUNTER_MASK]
+
+    def peek_time(self) -> Optional[int]:
+        """Time of the next event, or None if the queue is empty"""
+        key = self._early_top()
+        if key is not None:
+            return key >> _TIME_SHIFT
+        if self._current_bucket() is None:
+            return None
+        return self._base
+
+    def pop_all_at(self, time: int) -> List[Any]:
+        """
+        Remove and return every event due at or before `time`.
+
+        The cursor never moves past `time`, so events scheduled for `time`
+        while the batch is handled still land in the wheel.
+
+        :param time: Simulation time
+        :return: Events in the same order repeated pop_next() calls would give
+        """
+        events = self._events
+        limit = (time + 1) << _TIME_SHIFT
+        batch = []
+        dead = 0
+        early = self._early
+        while early and early[0] < limit:
+            event = events.pop(heapq.heappop(early) & _COUNTER_MASK, None)
+            if event is None:
+                dead += 1
+            else:
+                batch.append(event)
+
+        wheel, size, overflow = self._wheel, self._wheel_size, self._overflow
+        while self._base <= time:
+            bucket = wheel[self._base % size]
+            if bucket:
+                bucket.sort()
+                for key in bucket:
+                    event = events.pop(key & _COUNTER_MASK, None)
+                    if event is None:
+                        dead += 1
+                    else:
+                        batch.append(event)
+                self._in_wheel -= len(bucket)
+                bucket.clear()
+            if self._base == time:
+                break
+            if self._in_wheel == 0:
+                if not overflow or overflow[0] >= limit:
+                    break
+                self._base = overflow[0] >> _TIME_SHIFT
+            else:
+                self._base += 1
+            if overflow:
+                self._refill()
+        self._dead -= dead
+        return batch
+
+
+# PAIRING HEAP SCHEDULER
+# ============================================================================
+
+class PairingHeapScheduler(_SchedulerBase):
+    """
+    Event queue on a pairing heap of packed keys.
+
+    Insert and bulk insert are O(1) melds; pop is amortized O(log n) with the
+    usual two-pass merge of the root's children. Nodes are [key, children].
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._root = None
+        self._stored = 0    # keys in the heap, tombstones included
+
+    @staticmethod
+    def _meld(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b[0] < a[0]:
+            a, b = b, a
+        a[1].append(b)
+        return a
+
+    def schedule(self, event) -> int:
+        """
+        Schedule an event to be processed.
+
+        :param event: Event object with .time and .patient attributes
+        :return: Handle for cancel()/reschedule()
+        """
+        key = self._next_key(event)
+        self._root = self._meld(self._root, [key, []])
+        self._stored += 1
+        return key & _COUNTER_MASK
+
+    def _push_many(self, keys: List[int]):
+        meld, root = self._meld, self._root
+        for key in keys:
+            root = meld(root, [key, []])
+        self._root = root
+        self._stored += len(keys)
+
+    def _top_key(self) -> Optional[int]:
+        return None if self._root is None else self._root[0]
+
+    def _pop_key(self):
+        children = self._root[1]
+        meld = self._meld
+        # Pass 1: meld children pairwise, left to right
+        paired = [meld(children[i], children[i + 1] if i + 1 < len(children) else None)
+                  for i in range(0, len(children), 2)]
+        # Pass 2: fold the pairs right to left
+        root = None
+        for node in reversed(paired):
+            root = meld(node, root)
+        self._root = root
+        self._stored -= 1
+
+    def _compact(self):
+        events = self._events
+        keys, stack = [], [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            if (node[0] & _COUNTER_MASK) in events:
+                keys.append(node[0])
+            stack.extend(node[1])
+        self._root, self._stored = None, 0
+        self._push_many(keys)
+
+
+# SORTED-LIST SCHEDULER
+# ============================================================================
+
+class SortedListScheduler(_SchedulerBase):
+    """
+    Event queue kept as one sorted list of packed keys.
+
+    Pop is O(1) (a cursor walks the front of the list); insert is a bisect
+    plus a memmove, which stays cheap for small queues or traces where new
+    events mostly land near the end.
+    """
+
+    TRIM_AT = 1024  # Drop consumed keys once this many pile up at the front
+
+    def __init__(self):
+        super().__init__()
+        self._keys = []
+        self._head = 0      # Index of the smallest unconsumed key
+
+    def schedule(self, event) -> int:
+        """
+        Schedule an event to be processed.
+
+        :param event: Event object with .time and .patient attributes
+        :return: Handle for cancel()/reschedule()
+        """
+        key = self._next_key(event)
+        keys = self._keys
+        if not keys or key > keys[-1]:
+            keys.append(key)
+        else:
+            bisect.insort(keys, key, self._head)
+        return key & _COUNTER_MASK
+
+    def _push_many(self, keys: List[int]):
+        self._keys = sorted(self._keys[self._head:] + keys)
+        self._head = 0
+
+    def _top_key(self) -> Optional[int]:
+        return self._keys[self._head] if self._head < len(self._keys) else None
+
+    def _pop_key(self):
+        self._head += 1
+        if self._head >= self.TRIM_AT and self._head * 2 >= len(self._keys):
+            del self._keys[:self._head]
+            self._head = 0
+
+    def _compact(self):
+        events = self._events
+        self._keys = [key for key in self._keys[self._head:] if (key & _COUNTER_MASK) in events]
+        self._head = 0
+
+
+# RESOURCE
+# ============================================================================
+# Every bottleneck of the model - triage nurses, treatment rooms, admission
+# nurses - is a Resource: a set of numbered units with an attached wait
+# queue. The queue decides the discipline (FIFO AssessmentLine, priority
+# waiting room, FCFS-by-key KeyedQueue); the Resource hands queued items
+# to free units and integrates busy time and queue length over time.
+#
+# Queues implement push(item) (KeyedQueue: push(item, key)), pop(), peek(),
+# size() and is_empty().
+
+class Resource:
+    """
+    `capacity` numbered units and an optional wait queue.
+    
+    Free units live on a stack, so acquire and release are O(1); the most
+    recently freed unit is handed out first. Each unit
+    accumulates its busy time, and queue length is integrated over time
+    as items enter (request) and leave (dispatch) the queue.
+    """
+    
+    def __init__(self, capacity: int = 1, queue=None, first_unit: int = 0):
+        """
+        :param capacity: Number of units
+        :param queue: Wait queue (queue discipline); None for a bare pool
+        :param first_unit: Number of the first unit (0 for nurses, 1 for rooms)
+        """
+        if capacity < 1:
+            raise ValueError("a resource needs at least one unit")
+        self.queue = queue
+        self.first_unit = first_unit
+        self.capacity = capacity
+        self._free = list(range(capacity - 1, -1, -1))  # free unit indexes (top = next)
+        self._available = capacity
+        self._held = bytearray(self.capacity)
+        self._since = [None] * self.capacity   # start of the current busy period
+        self._busy = [0] * self.capacity       # closed busy time per unit
+        
+        # Queue instrumentation
+        self.served = 0
+        self.max_queue = 0
+        self._queue_area = 0
+        self._queue_last = None
+    
+    # Units
+    def acquire(self, now: Optional[int] = None) -> Optional[int]:
+        """
+        Take a free unit.
+        
+        :param now: Start of the busy period (None: not timed)
+        :return: Unit number, or None if no unit is free
+        """
+        if not self._available:
+            return None
+        i = self._free.pop()
+        self._held[i] = 1
+        self._since[i] = now
+        self._available -= 1
+        return i + self.first_unit
+    
+    def acquire_many(self, count: int, now: Optional[int] = None) -> List[int]:
+        """Take up to `count` free units (at most the free count)."""
+        units = []
+        for _ in range(min(count, self._available)):
+            units.append(self.acquire(now))
+        return units
+    
+    def release(self, unit: int, now: Optional[int] = None):
+        """
+        Return a unit; releasing a free unit is ignored.
+        
+        :param unit: Unit number from acquire()
+        :param now: End of the busy period (None: not timed)
+        """
+        i = unit - self.first_unit
+        if not 0 <= i < self.capacity or not self._held[i]:
+            return
+        since = self._since[i]
+        if since is not None and now is not None:
+            self._busy[i] += now - since
+        self._held[i] = 0
+        self._since[i] = None
+        self._free.append(i)
+        self._available += 1
+    
+    def is_held(self, unit: int) -> bool:
+        """Check if a unit is in use"""
+        i = unit - self.first_unit
+        return 0 <= i < self.capacity and bool(self._held[i])
+    
+    def free_count(self) -> int:
+        """Get number of free units"""
+        return self._available
+    
+    def busy_count(self) -> int:
+        """Get number of units in use"""
+        return self.capacity - self._available
+    
+    def is_any_free(self) -> bool:
+        """Check if any unit is free"""
+        return self._available > 0
+    
+    # Queue
+    def _wait_queue(self):
+        if self.queue is None:
+            raise RuntimeError(f"{type(self).__name__} has no wait queue; "
+                               "create it with a queue to request/dispatch")
+        return self.queue
+    
+    def _advance_queue(self, now):
+        if now is None:
+            return
+        if self._queue_last is not None:
+            self._queue_area += self.queue.size() * (now - self._queue_last)
+        self._queue_last = now
+    
+    def request(self, item, now: Optional[int] = None, key=None):
+        """
+        Put an item in the wait queue (pass `key` for a KeyedQueue).
+        Items are started by dispatch().
+        
+        :raises RuntimeError: If the resource has no wait queue
+        """
+        queue = self._wait_queue()
+        self._advance_queue(now)
+        if key is None:
+            queue.push(item)
+        else:
+            queue.push(item, key)
+        if queue.size() > self.max_queue:
+            self.max_queue = queue.size()
+    
+    def waiting(self) -> int:
+        """Get number of items in the wait queue (0 without a queue)"""
+        return 0 if self.queue is None else self.queue.size()
+    
+    def dispatch(self, now: int, limit: Optional[int] = None) -> list:
+        """
+        Start as many queued items as there are free units (at most `limit`),
+        in queue order.
+        
+        :return: [(item, unit), ...]
+        :raises RuntimeError: If the resource has no wait queue
+        """
+        queue = self._wait_queue()
+        count = min(self._available, queue.size())
+        if limit is not None:
+            count = min(count, limit)
+        if count <= 0:
+            return []
+        self._advance_queue(now)
+        started = [(queue.pop(), self.acquire(now)) for _ in range(count)]
+        self.served += count
+        return started
+    
+    # Instrumentation
+    def busy_times(self, now: Optional[int] = None) -> List[int]:
+        """Busy time of each unit; with `now`, open busy periods count up to it."""
+        if now is None:
+            return list(self._busy)
+        return [busy + (now - since if since is not None else 0)
+                for busy, since in zip(self._busy, self._since)]
+    
+    def busy_time(self, now: Optional[int] = None) -> int:
+        """Total busy unit-time (the integral of units in use)."""
+        return sum(self.busy_times(now))
+    
+    def utilization(self, span: int, now: Optional[int] = None) -> List[float]:
+        """
+        Fraction of `span` each unit spent busy.
+        
+        :param span: Length of the observed period
+        :param now: Count open busy periods up to this time
+        :return: One utilization per unit (0 if span is 0)
+        """
+        return [busy / span if span else 0 for busy in self.busy_times(now)]
+    
+    def queue_time(self, now: Optional[int] = None) -> int:
+        """
+        Total item-time spent in the queue (the integral of queue length),
+        up to `now` (default: the last request or dispatch).
+        """
+        if now is not None and self._queue_last is not None:
+            return self._queue_area + self.queue.size() * (now - self._queue_last)
+        return self._queue_area
+
+
+class KeyedQueue:
+    """
+    FCFS-by-key queue: pops the smallest key first, ties in push order.
+    A binary heap, so push and pop are O(log n).
+    """
+    
+    def __init__(self):
+        self._heap = []  # (key, counter, item)
+        self._counter = 0
+    
+    def push(self, item, key):
+        heapq.heappush(self._heap, (key, self._counter, item))
+        self._counter += 1
+    
+    def pop(self) -> Optional[Any]:
         if self._heap:
-            return self._heap[0][1]
+            return heapq.heappop(self._heap)[2]
         return None
     
+    def peek(self) -> Optional[Any]:
+        return self._heap[0][2] if self._heap else None
+    
+    def peek_key(self):
+        return self._heap[0][0] if self._heap else None
+    
     def size(self) -> int:
-        """Get number of events in queue"""
         return len(self._heap)
+    
+    def is_empty(self) -> bool:
+        return not self._heap
 
 
 # ASSESSMENT LINE (FIFO)
@@ -93,11 +947,12 @@ class EventScheduler:
 class AssessmentLine:
     """
     FIFO queue for walk-in patients waiting for triage assessment.
-    First in, first out.
+    First in, first out. Backed by a deque, so both ends are O(1) however
+    long the line gets during a walk-in surge.
     """
     
     def __init__(self):
-        self._queue = []
+        self._queue = deque()
     
     def enqueue_assessment(self, patient):
         """
@@ -114,7 +969,7 @@ class AssessmentLine:
         :return: Patient object, or None if line is empty
         """
         if self._queue:
-            return self._queue.pop(0)
+            return self._queue.popleft()
         return None
     
     def is_empty(self) -> bool:
@@ -130,6 +985,25 @@ class AssessmentLine:
         if self._queue:
             return self._queue[0]
         return None
+    
+    # Resource queue interface
+    push = enqueue_assessment
+    pop = dequeue_assessment
+
+
+# NURSE POOL
+# ============================================================================
+
+class NursePool(Resource):
+    """
+    A pool of k interchangeable nurses numbered from 0 (the triage nurses,
+    1 by default), optionally with their wait queue.
+    """
+    
+    def __init__(self, size: int = 1, queue=None):
+        if size < 1:
+            raise ValueError("a nurse pool needs at least one nurse")
+        super().__init__(size, queue)
 
 
 # WAITING ROOM (PRIORITY QUEUE)
@@ -183,21 +1057,318 @@ class WaitingRoom:
         if self._heap:
             return self._heap[0][1]
         return None
+    
+    # Resource queue interface
+    push = waitingroom_push
+    pop = waitingroom_pop_best
 
 
-# ADMISSION LINE (FCFS by treatment finish time)
+# BUCKET WAITING ROOM
 # ============================================================================
 
-class AdmissionLine:
+class BucketWaitingRoom:
     """
-    Queue for Priority 1 patients waiting for the single admission nurse.
-    First-come-first-served based on when treatment finished.
+    Waiting room as a bucket queue, same (priority, patient ID) order as
+    WaitingRoom.
+    
+    Priorities only take the values 1-5 and patients mostly enter in ID
+    order, so each priority gets a FIFO deque and a bitmask records which
+    levels are non-empty: push and pop are O(1). A patient whose ID is
+    lower than the tail of their level (e.g. an emergency that skipped
+    triage entering after a walk-in registered later) goes to that level's
+    small heap instead, and pops compare the two heads.
     """
     
+    PRIORITY_LEVELS = 5
+    
     def __init__(self):
-        self._queue = []  # List of (wait_start_time, patient) tuples
-        self._nurse_busy = False
-        self._current_patient = None
+        n = self.PRIORITY_LEVELS + 1  # index = priority; 0 unused
+        self._fifo = [deque() for _ in range(n)]
+        self._late = [[] for _ in range(n)]  # (patient_id, patient) heaps
+        self._mask = 0  # bit p set when level p is non-empty
+        self._size = 0
+    
+    def waitingroom_push(self, patient):
+        """
+        Add a patient to the waiting room.
+        
+        :param patient: Patient object with .priority (1-5) and .id attributes
+        """
+        level = patient.priority
+        if not 1 <= level <= self.PRIORITY_LEVELS:
+            raise ValueError(f"priority must be 1-{self.PRIORITY_LEVELS}, got {level}")
+        fifo = self._fifo[level]
+        if fifo and patient.id < fifo[-1].id:
+            heapq.heappush(self._late[level], (patient.id, patient))
+        else:
+            fifo.append(patient)
+        self._mask |= 1 << level
+        self._size += 1
+    
+    def _best_level(self) -> int:
+        mask = self._mask
+        return (mask & -mask).bit_length() - 1
+    
+    def waitingroom_pop_best(self) -> Optional[Any]:
+        """
+        Remove and return the highest priority patient.
+        Priority 1 is highest. Ties broken by patient ID.
+        
+        :return: Patient object, or None if waiting room is empty
+        """
+        if not self._mask:
+            return None
+        level = self._best_level()
+        fifo, late = self._fifo[level], self._late[level]
+        if late and (not fifo or late[0][0] < fifo[0].id):
+            patient = heapq.heappop(late)[1]
+        else:
+            patient = fifo.popleft()
+        if not fifo and not late:
+            self._mask &= ~(1 << level)
+        self._size -= 1
+        return patient
+    
+    def is_empty(self) -> bool:
+        """Check if waiting room is empty"""
+        return self._size == 0
+    
+    def size(self) -> int:
+        """Get number of patients in waiting room"""
+        return self._size
+    
+    def peek(self) -> Optional[Any]:
+        """Look at next patient without removing"""
+        if not self._mask:
+            return None
+        level = self._best_level()
+        fifo, late = self._fifo[level], self._late[level]
+        if late and (not fifo or late[0][0] < fifo[0].id):
+            return late[0][1]
+        return fifo[0]
+    
+    # Resource queue interface
+    push = waitingroom_push
+    pop = waitingroom_pop_best
+
+
+# INDEXED WAITING ROOM
+# ============================================================================
+
+class IndexedWaitingRoom:
+    """
+    Addressable waiting room: a binary heap in (rank, patient ID) order plus
+    a position index per patient ID, so a waiting patient can be re-triaged
+    (update_priority) or leave without being seen (remove) in O(log n).
+    
+    A patient's rank starts at their priority. With aging_interval > 0,
+    age(now) improves the rank of every patient who has waited another
+    aging_interval by one level, down to aging_floor, so priority-5
+    walk-ins cannot starve. Aging only changes queue order, not
+    patient.priority (which decides routing after treatment). Due agings
+    come off a heap of (next_age_time, patient ID), so a pass costs
+    O(log n) per aged patient instead of a rebuild. Each heap entry also
+    records its own next aging time; aging-heap items that no longer match
+    it (the patient left, or left and came back) are skipped.
+    """
+    
+    def __init__(self, aging_interval: int = 0, aging_floor: int = 2):
+        self._heap = []   # [rank, patient_id, patient, next_age_time or None]
+        self._pos = {}    # patient_id -> index in _heap
+        self._aging = []  # (next_age_time, patient_id); stale items are skipped
+        self.aging_interval = aging_interval
+        self.aging_floor = aging_floor
+        self._now = 0     # Latest time seen by push/age (default for update_priority)
+    
+    # Heap plumbing
+    def _less(self, a, b) -> bool:
+        return a[0] < b[0] or (a[0] == b[0] and a[1] < b[1])
+    
+    def _sift_up(self, i: int):
+        heap, pos = self._heap, self._pos
+        entry = heap[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if not self._less(entry, heap[parent]):
+                break
+            heap[i] = heap[parent]
+            pos[heap[i][1]] = i
+            i = parent
+        heap[i] = entry
+        pos[entry[1]] = i
+    
+    def _sift_down(self, i: int):
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        entry = heap[i]
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and self._less(heap[child + 1], heap[child]):
+                child += 1
+            if not self._less(heap[child], entry):
+                break
+            heap[i] = heap[child]
+            pos[heap[i][1]] = i
+            i = child
+        heap[i] = entry
+        pos[entry[1]] = i
+    
+    def _remove_at(self, i: int):
+        heap = self._heap
+        entry = heap[i]
+        del self._pos[entry[1]]
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1]])
+        return entry[2]
+    
+    # Waiting-room interface
+    def waitingroom_push(self, patient, now: Optional[int] = None):
+        """
+        Add a patient to the waiting room.
+        
+        :param patient: Patient object with .priority and .id attributes
+        :param now: Entry time for aging (default patient.treatment_wait_start)
+        """
+        if patient.id in self._pos:
+            raise ValueError(f"patient {patient.id} is already waiting")
+        entry = [patient.priority, patient.id, patient, None]
+        self._heap.append(entry)
+        self._sift_up(len(self._heap) - 1)
+        if self.aging_interval > 0 and patient.priority > self.aging_floor:
+            if now is None:
+                now = getattr(patient, "treatment_wait_start", None) or 0
+            self._now = max(self._now, now)
+            entry[3] = now + self.aging_interval
+            heapq.heappush(self._aging, (entry[3], patient.id))
+    
+    def waitingroom_pop_best(self) -> Optional[Any]:
+        """
+        Remove and return the best-ranked patient. Ties broken by patient ID.
+        
+        :return: Patient object, or None if waiting room is empty
+        """
+        if self._heap:
+            return self._remove_at(0)
+        return None
+    
+    def is_empty(self) -> bool:
+        """Check if waiting room is empty"""
+        return len(self._heap) == 0
+    
+    def size(self) -> int:
+        """Get number of patients in waiting room"""
+        return len(self._heap)
+    
+    def peek(self) -> Optional[Any]:
+        """Look at next patient without removing"""
+        if self._heap:
+            return self._heap[0][2]
+        return None
+    
+    # Addressable operations
+    def __contains__(self, patient_id) -> bool:
+        return patient_id in self._pos
+    
+    def rank_of(self, patient_id: int) -> Optional[int]:
+        """Current queue rank of a waiting patient (None if not waiting)"""
+        i = self._pos.get(patient_id)
+        return None if i is None else self._heap[i][0]
+    
+    def update_priority(self, patient_id: int, priority: int, now: Optional[int] = None) -> bool:
+        """
+        Re-triage a waiting patient: set patient.priority and their rank.
+        
+        Levels already earned by aging carry over to the new priority (not
+        past aging_floor). A patient whose new rank is above the floor keeps
+        aging on their current clock, or from `now` if they had stopped.
+        
+        :param now: Current simulation time (default: latest time seen by push/age)
+        :return: True if the patient was waiting
+        """
+        i = self._pos.get(patient_id)
+        if i is None:
+            return False
+        entry = self._heap[i]
+        earned = max(0, entry[2].priority - entry[0])
+        entry[2].priority = priority
+        rank = max(priority - earned, min(priority, self.aging_floor))
+        old, entry[0] = entry[0], rank
+        if rank < old:
+            self._sift_up(i)
+        elif rank > old:
+            self._sift_down(i)
+        if self.aging_interval > 0 and rank > self.aging_floor:
+            if entry[3] is None:
+                entry[3] = (self._now if now is None else now) + self.aging_interval
+                heapq.heappush(self._aging, (entry[3], patient_id))
+        else:
+            entry[3] = None
+        return True
+    
+    def remove(self, patient_id: int) -> Optional[Any]:
+        """
+        Take a patient out of the waiting room (e.g. left without being seen).
+        
+        :return: The patient, or None if they were not waiting
+        """
+        i = self._pos.get(patient_id)
+        if i is None:
+            return None
+        return self._remove_at(i)
+    
+    def age(self, now: int) -> int:
+        """
+        Aging pass: every patient whose next aging time has come moves up one
+        rank (not past aging_floor) and is due again aging_interval later.
+        
+        :param now: Current simulation time
+        :return: Number of patients aged
+        """
+        self._now = max(self._now, now)
+        aging, aged = self._aging, 0
+        while aging and aging[0][0] <= now:
+            due, pid = heapq.heappop(aging)
+            i = self._pos.get(pid)
+            if i is None or self._heap[i][3] != due:
+                continue  # left the waiting room (and maybe came back) since
+            entry = self._heap[i]
+            if entry[0] > self.aging_floor:
+                entry[0] -= 1
+                self._sift_up(i)
+                aged += 1
+            if entry[0] > self.aging_floor:
+                entry[3] = due + self.aging_interval
+                heapq.heappush(aging, (entry[3], pid))
+            else:
+                entry[3] = None
+        return aged
+    
+    # Resource queue interface
+    push = waitingroom_push
+    pop = waitingroom_pop_best
+
+
+# ADMISSION LINE (FCFS by treatment finish time)
+# ============================================================================
+
+class AdmissionLine(Resource):
+    """
+    Priority 1 patients waiting for an admission nurse (1 by default): a
+    Resource of nurses numbered from 0 whose queue is FCFS by treatment
+    finish time, ties broken by patient id.
+    
+    A waiting P1 still occupies their treatment room, so the queue-length
+    integral is the room-time blocked by patients awaiting admission.
+    """
+    
+    def __init__(self, nurses: int = 1):
+        super().__init__(nurses, KeyedQueue())
     
     def admission_enqueue(self, patient, wait_start_time):
         """
@@ -206,26 +1377,34 @@ class AdmissionLine:
         :param patient: Patient object
         :param wait_start_time: Time when patient's treatment finished
         """
-        self._queue.append((wait_start_time, patient))
-        # Sort by wait_start_time to maintain FCFS
-        self._queue.sort(key=lambda x: x[0])
+        self.request(patient, wait_start_time, key=(wait_start_time, patient.id))
     
-    def admission_peek_pop_if_free(self, now) -> Optional[Any]:
+    def admission_start(self, now):
         """
-        If nurse is free, pop next patient and mark nurse as busy.
+        If a nurse is free, pop the next patient and assign them that nurse.
         
         :param now: Current simulation time
-        :return: Patient object if nurse was free, None if nurse busy or no patients
+        :return: (patient, wait_start_time, nurse), or None if every nurse is
+                 busy or no patient is waiting
         """
-        if self._nurse_busy:
+        key = self.queue.peek_key()
+        started = self.dispatch(now, limit=1)
+        if not started:
             return None
+        patient, nurse = started[0]
+        return patient, key[0], nurse
+    
+    def admission_peek_pop_if_free(self, now) -> Optional[Any]:
+        """
+        If a nurse is free, pop next patient and mark that nurse as busy.
         
-        if not self._queue:
+        :param now: Current simulation time
+        :return: Patient object if a nurse was free, None if nurses busy or no patients
+        """
+        started = self.admission_start(now)
+        if started is None:
             return None
-        
-        wait_start_time, patient = self._queue.pop(0)
-        self._nurse_busy = True
-        self._current_patient = patient
+        patient, wait_start_time, _ = started
         
         # Calculate admission wait time
         if hasattr(patient, 'admission_wait'):
@@ -233,46 +1412,76 @@ class AdmissionLine:
         
         return patient
     
-    def nurse_free(self):
+    def nurse_free(self, nurse: Optional[int] = None, now: Optional[int] = None):
         """
-        Mark the admission nurse as free (called after admission completes).
+        Mark an admission nurse as free (called after admission completes).
+        
+        :param nurse: Nurse number from admission_start (default: the
+                      lowest-numbered busy nurse)
+        :param now: Current simulation time, for nurse utilization
         """
-        self._nurse_busy = False
-        self._current_patient = None
+        if nurse is None:
+            nurse = next((n for n in range(self.capacity) if self.is_held(n)), None)
+            if nurse is None:
+                return
+        self.release(nurse, now)
     
     def is_nurse_busy(self) -> bool:
-        """Check if admission nurse is currently busy"""
-        return self._nurse_busy
+        """Check if every admission nurse is currently busy"""
+        return not self.is_any_free()
+    
+    def nurses(self) -> Resource:
+        """The admission nurses (this Resource), for utilization reports"""
+        return self
+    
+    @property
+    def admitted(self) -> int:
+        """Number of admissions started"""
+        return self.served
+    
+    @property
+    def max_blocked(self) -> int:
+        """Most P1 patients waiting (rooms blocked) at once"""
+        return self.max_queue
     
     def is_empty(self) -> bool:
         """Check if admission queue is empty"""
-        return len(self._queue) == 0
+        return self.queue.is_empty()
     
     def size(self) -> int:
         """Get number of patients waiting for admission"""
-        return len(self._queue)
+        return self.queue.size()
     
     def peek(self) -> Optional[Any]:
         """Look at next patient without removing"""
-        if self._queue:
-            return self._queue[0][1]
-        return None
+        return self.queue.peek()
+    
+    def blocked_room_time(self, now: Optional[int] = None) -> int:
+        """
+        Total room-time P1 patients have spent in a room waiting for a nurse,
+        up to `now` (default: the last change to the line).
+        """
+        return self.queue_time(now)
 
 
 # TREATMENT ROOMS MANAGER
 # ============================================================================
 
-class RoomsManager:
+class RoomsManager(Resource):
     """
-    Manages 3 treatment rooms.
-    Tracks availability and publishes count changes.
+    Manages the treatment rooms (3 by default): a Resource of rooms
+    numbered from 1 whose queue is the waiting room.
     """
     
     TOTAL_ROOMS = 3
     
-    def __init__(self):
-        self._total = self.TOTAL_ROOMS
-        self._occupied = 0
+    def __init__(self, total_rooms: Optional[int] = None, waiting_room=None):
+        """
+        :param total_rooms: Number of rooms
+        :param waiting_room: The rooms' wait queue (used by dispatch)
+        """
+        super().__init__(self.TOTAL_ROOMS if total_rooms is None else total_rooms,
+                         waiting_room, first_unit=1)
     
     def acquire_if_available(self) -> bool:
         """
@@ -280,45 +1489,91 @@ class RoomsManager:
         
         :return: True if room was acquired, False if all rooms occupied
         """
-        if self._occupied < self._total:
-            self._occupied += 1
-            return True
-        return False
+        return self.acquire() is not None
     
-    def release(self):
+    def release(self, room_id: Optional[int] = None, now: Optional[int] = None):
         """
         Release a treatment room (patient departed).
+        
+        :param room_id: Room to free (default: the highest-numbered occupied
+                        room, for callers that do not track room ids)
+        :param now: End of the occupancy, for room utilization
         """
-        if self._occupied > 0:
-            self._occupied -= 1
+        if room_id is None:
+            room_id = next((r for r in range(self.capacity, 0, -1) if self.is_held(r)), None)
+            if room_id is None:
+                return
+        super().release(room_id, now)
     
     def get_available_count(self) -> int:
-        """
-        Get number of currently available rooms.
-        
-        :return: Number of free rooms (0-3)
-        """
-        return self._total - self._occupied
+        """Get number of currently available rooms"""
+        return self.free_count()
     
     def get_occupied_count(self) -> int:
         """Get number of occupied rooms"""
-        return self._occupied
+        return self.busy_count()
     
     def is_any_available(self) -> bool:
         """Check if any room is available"""
-        return self._occupied < self._total
+        return self.is_any_free()
     
     def are_all_occupied(self) -> bool:
         """Check if all rooms are occupied"""
-        return self._occupied >= self._total
+        return not self.is_any_free()
 
 
 # FACTORY FUNCTIONS
 # ============================================================================
 
-def create_scheduler():
-    """Create and return an EventScheduler instance"""
-    return EventScheduler()
+# Scheduler backends selectable by name; all share the _SchedulerBase interface
+SCHEDULER_BACKENDS = {
+    'heap': EventScheduler,
+    'pairing': PairingHeapScheduler,
+    'calendar': CalendarScheduler,
+    'sorted': SortedListScheduler,
+}
+
+
+def choose_scheduler_backend(arrival_times) -> str:
+    """
+    Pick a scheduler backend from a sample of arrival times.
+
+    - Short traces: 'sorted' (a few hundred pending events fit in one list)
+    - Dense traces over a bounded time range: 'calendar' (most ticks have events)
+    - Anything else (sparse or very spread out): 'heap'
+
+    :param arrival_times: Arrival times from the start of the trace
+    :return: Backend name from SCHEDULER_BACKENDS
+    """
+    times = list(arrival_times)
+    if len(times) < 256:
+        return 'sorted'
+    span = max(times) - min(times) + 1
+    if span <= (1 << 24) and len(times) / span >= 0.05:
+        return 'calendar'
+    return 'heap'
+
+
+def create_scheduler(backend: str = 'heap', arrival_times=None):
+    """
+    Create and return an event scheduler.
+    
+    :param backend: One of SCHEDULER_BACKENDS, or 'auto' to pick from arrival_times
+    :param arrival_times: Sample of arrival times used by 'auto' (none: 'heap')
+    :return: Scheduler instance
+    """
+    if backend == 'auto':
+        backend = choose_scheduler_backend(arrival_times) if arrival_times else 'heap'
+    try:
+        return SCHEDULER_BACKENDS[backend]()
+    except KeyError:
+        raise ValueError(f"Unknown scheduler backend {backend!r}; "
+                         f"choose from {sorted(SCHEDULER_BACKENDS)} or 'auto'") from None
+
+
+def create_calendar_scheduler(wheel_size: int = CalendarScheduler.DEFAULT_WHEEL_SIZE):
+    """Create and return a CalendarScheduler (timing wheel) instance"""
+    return CalendarScheduler(wheel_size)
 
 
 def create_assessment_line():
@@ -326,33 +1581,76 @@ def create_assessment_line():
     return AssessmentLine()
 
 
-def create_waiting_room():
-    """Create and return a WaitingRoom instance"""
-    return WaitingRoom()
+def create_nurse_pool(size: int = 1, queue=None):
+    """Create a NursePool of `size` nurses, optionally with their wait queue"""
+    return NursePool(size, queue)
+
+
+# Waiting-room implementations selectable by name; same push/pop/peek/size interface
+WAITING_ROOMS = {
+    'bucket': BucketWaitingRoom,
+    'heap': WaitingRoom,
+    'indexed': IndexedWaitingRoom,
+}
+
+
+def create_waiting_room(kind: str = 'bucket', **options):
+    """
+    Create and return a waiting room.
+    
+    :param kind: 'bucket' (BucketWaitingRoom, the default), 'heap' (WaitingRoom)
+                 or 'indexed' (IndexedWaitingRoom: re-triage, removal, aging)
+    :param options: Constructor arguments, e.g. aging_interval for 'indexed'
+    """
+    try:
+        cls = WAITING_ROOMS[kind]
+    except KeyError:
+        raise ValueError(f"Unknown waiting room {kind!r}; choose from {sorted(WAITING_ROOMS)}") from None
+    return cls(**options)
 
 
-def create_admission_line():
-    """Create and return an AdmissionLine instance"""
-    return AdmissionLine()
+def create_admission_line(nurses: int = 1):
+    """Create and return an AdmissionLine with `nurses` admission nurses"""
+    return AdmissionLine(nurses)
 
 
-def create_rooms_manager():
-    """Create and return a RoomsManager instance"""
-    return RoomsManager()
+def create_rooms_manager(total_rooms=None, waiting_room=None):
+    """Create and return a RoomsManager instance (TOTAL_ROOMS rooms by default)"""
+    return RoomsManager(total_rooms, waiting_room)
 
 
-def create_all_resources():
+def create_all_resources(initial_events=None, scheduler_backend='heap', arrival_times=None,
+                         total_rooms=None, triage_nurses=1, admission_nurses=1,
+                         aging_interval=0, aging_floor=2):
     """
     Convenience function to create all shared resources at once.
     
-    :return: Dictionary with all resources
+    :param initial_events: Optional iterable of events to preload into the scheduler
+    :param scheduler_backend: Scheduler backend name (see create_scheduler)
+    :param arrival_times: Sample of arrival times for scheduler_backend='auto'
+    :param total_rooms: Number of treatment rooms (default RoomsManager.TOTAL_ROOMS)
+    :param triage_nurses: Number of triage nurses
+    :param admission_nurses: Number of admission nurses
+    :param aging_interval: Waiting-room aging interval; > 0 uses an IndexedWaitingRoom
+    :param aging_floor: Best rank aging can reach (IndexedWaitingRoom only)
+    :return: Dictionary with all resources; each queue is also attached to
+             its Resource (triage_nurses.queue is the assessment line,
+             rooms.queue the waiting room)
     """
+    scheduler = create_scheduler(scheduler_backend, arrival_times)
+    if initial_events is not None:
+        scheduler.schedule_many(initial_events)
+    assessment_line = create_assessment_line()
+    waiting_room = (create_waiting_room('indexed', aging_interval=aging_interval,
+                                        aging_floor=aging_floor)
+                    if aging_interval > 0 else create_waiting_room())
     return {
-        'scheduler': create_scheduler(),
-        'assessment_line': create_assessment_line(),
-        'waiting_room': create_waiting_room(),
-        'admission_line': create_admission_line(),
-        'rooms': create_rooms_manager()
+        'scheduler': scheduler,
+        'assessment_line': assessment_line,
+        'triage_nurses': create_nurse_pool(triage_nurses, assessment_line),
+        'waiting_room': waiting_room,
+        'admission_line': create_admission_line(admission_nurses),
+        'rooms': create_rooms_manager(total_rooms, waiting_room)
     }
 
 
@@ -368,20 +1666,31 @@ if __name__ == "__main__":
     print("\n1. EventScheduler")
     print("   - schedule(event): Add event to queue")
     print("   - pop_next(): Get next event by time/priority/patient#")
+    print("   - drain_tick(): Get every event at the next time, in order")
+    print("   - create_scheduler(backend): 'heap', 'pairing', 'calendar', 'sorted' or 'auto'")
     print("\n2. AssessmentLine (FIFO)")
     print("   - enqueue_assessment(patient): Add to line")
     print("   - dequeue_assessment(): Get next patient")
+    print("   - NursePool(k): acquire(now) / release(nurse, now), per-nurse utilization")
     print("\n3. WaitingRoom (Priority Queue)")
     print("   - waitingroom_push(patient): Add patient")
     print("   - waitingroom_pop_best(): Get highest priority patient")
+    print("   - BucketWaitingRoom: same order, one FIFO per priority (factory default)")
+    print("   - IndexedWaitingRoom: update_priority / remove / age(now) in O(log n)")
     print("\n4. AdmissionLine (FCFS by treatment finish time)")
     print("   - admission_enqueue(patient, wait_start_time): Add patient")
     print("   - admission_peek_pop_if_free(now): Get next if nurse free")
-    print("   - nurse_free(): Mark nurse as available")
+    print("   - nurse_free(nurse, now): Mark nurse as available")
+    print("   - blocked_room_time(now): Room-time held by P1s awaiting admission")
     print("\n5. RoomsManager (3 treatment rooms)")
     print("   - acquire_if_available(): Try to get a room")
-    print("   - release(): Free up a room")
+    print("   - acquire(now) / acquire_many(n): Take numbered rooms")
+    print("   - release(room_id): Free up a room")
     print("   - get_available_count(): Check how many rooms free")
+    print("\n6. Resource (capacity + wait queue)")
+    print("   - request(item, now) / dispatch(now) / release(unit, now)")
+    print("   - busy_times(now), utilization(span), queue_time(now)")
+    print("   - Triage nurses, admission nurses and rooms are all Resources")
     print("\n" + "=" * 70)
     print("\nTo use in simulation:")
     print("  resources = create_all_resources()")
@@ -0,0 +1,167 @@
+# sweep.py
+
+"""
+Parameter sweeps for capacity what-if studies.
+
+A sweep is every (config, trace, seed) cell of a list of SimulationConfigs
+(see config.expand_grid) x traces x triage seeds. Cells fan out over a
+process pool and rows stream back as they finish. With a cache file, each
+finished cell is appended to it as one JSON line keyed by (config, trace
+SHA-1, seed), so an interrupted or extended sweep only runs the new cells.
+
+    python sweep.py cache.jsonl data1.txt data2.txt
+"""
+
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+
+from config import SimulationConfig, expand_grid
+from replications import replication_seeds, run_replication
+
+
+def trace_digest(path: str) -> str:
+    """SHA-1 of the trace's bytes, so renamed copies share cache entries."""
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _cell_key(config: SimulationConfig, sha1: str, seed: int) -> tuple:
+    return (config.key(), sha1, seed)
+
+
+class SweepCache:
+    """
+    Append-only JSONL store of finished sweep cells. A missing file is an
+    empty cache; a torn last line (interrupted write) is ignored.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._rows = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        row = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._rows[self.row_key(row)] = row
+        self._out = None
+
+    @staticmethod
+    def row_key(row: dict) -> tuple:
+        return _cell_key(SimulationConfig(**row["config"]), row["trace_sha1"], row["seed"])
+
+    def get(self, key: tuple):
+        return self._rows.get(key)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, row: dict) -> None:
+        if self._out is None:
+            self._out = open(self.path, "a", encoding="utf-8")
+        self._out.write(json.dumps(row, sort_keys=True) + "\n")
+        self._out.flush()
+        self._rows[self.row_key(row)] = row
+
+    def close(self) -> None:
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+
+
+def run_cell(config: SimulationConfig, trace: str, sha1: str, seed: int,
+             scheduler_backend: str = "heap") -> dict:
+    """Run one sweep cell and return its row (JSON-compatible)."""
+    summary = run_replication(trace, seed, scheduler_backend, config)
+    row = {"config": asdict(config), "trace": trace, "trace_sha1": sha1,
+           "seed": seed, "summary": summary}
+    # Round-trip so fresh rows look exactly like cached ones (str priority keys)
+    return json.loads(json.dumps(row))
+
+
+def _run_cell(args):
+    return run_cell(*args)
+
+
+def iter_sweep(configs, traces, seeds, workers: int = None, cache_path: str = None,
+               scheduler_backend: str = "heap"):
+    """
+    Yield one row per (config, trace, seed) cell: cached rows first, then
+    computed rows in completion order.
+
+    :param configs: SimulationConfigs (e.g. from expand_grid)
+    :param traces: Arrival trace paths
+    :param seeds: Triage seeds, or an int n for replication_seeds(n)
+    :param workers: Worker processes (default os.cpu_count(); 1 runs in-process)
+    :param cache_path: JSONL cache file; None disables caching
+    :param scheduler_backend: Scheduler backend name (see create_scheduler)
+    """
+    if isinstance(seeds, int):
+        seeds = replication_seeds(seeds)
+    cache = SweepCache(cache_path) if cache_path else None
+    digests = {trace: trace_digest(trace) for trace in traces}
+
+    todo = []
+    for config in configs:
+        for trace in traces:
+            for seed in seeds:
+                row = cache.get(_cell_key(config, digests[trace], seed)) if cache else None
+                if row is not None:
+                    yield row
+                else:
+                    todo.append((config, trace, digests[trace], seed, scheduler_backend))
+
+    try:
+        workers = min(workers or os.cpu_count() or 1, len(todo))
+        if workers <= 1:
+            finished = map(_run_cell, todo)
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers)
+            finished = (future.result() for future in
+                        as_completed([pool.submit(_run_cell, cell) for cell in todo]))
+        for row in finished:
+            if cache is not None:
+                cache.add(row)
+            yield row
+    finally:
+        if workers > 1:
+            pool.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.close()
+
+
+def run_sweep(configs, traces, seeds, workers: int = None, cache_path: str = None,
+              scheduler_backend: str = "heap") -> list:
+    """All rows of a sweep as a list (see iter_sweep)."""
+    return list(iter_sweep(configs, traces, seeds, workers, cache_path, scheduler_backend))
+
+
+SWEEP_COLUMNS = ("total_rooms", "triage_nurses", "assessment_time", "admission_time",
+                 "departure_delay")
+
+def print_sweep_row(row: dict) -> None:
+    c, s = row["config"], row["summary"]
+    params = "\t".join(str(c[name]) for name in SWEEP_COLUMNS)
+    print(f"{params}\t{os.path.basename(row['trace'])}\t{row['seed']}\t"
+          f"{s['mean_wait']:.2f}\t{s['room_utilization']:.3f}")
+
+
+def print_sweep_header() -> None:
+    print("\t".join(SWEEP_COLUMNS + ("trace", "seed", "mean_wait", "utilization")))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("usage: python sweep.py CACHE.jsonl TRACE [TRACE ...]")
+    grid = expand_grid(total_rooms=[2, 3, 4], admission_time=[3, 5])
+    print_sweep_header()
+    for row in iter_sweep(grid, sys.argv[2:], seeds=8, cache_path=sys.argv[1]):
+        print_sweep_row(row)
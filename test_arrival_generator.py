@@ -0,0 +1,44 @@
+from arrival_generator import SyntheticArrivalSource, daily_rate_profile, uniform_treatment
+from arrival_manager import open_input_file, next_arrival_if_due
+
+def records(source):
+    out = []
+    rec = source.next_record()
+    while rec is not None:
+        out.append(rec)
+        rec = source.next_record()
+    return out
+
+def test_poisson_stream_is_sorted_and_bounded():
+    recs = records(SyntheticArrivalSource(rate=0.5, walkin_fraction=0.3,
+                                          treatment=uniform_treatment(1, 9), count=5000, seed=1))
+    assert len(recs) == 5000
+    times = [t for t, _, _ in recs]
+    assert times == sorted(times)
+    assert all(p in ("E", "W") and 1 <= tr <= 9 for _, p, tr in recs)
+    # Rate 0.5 -> about 10000 time units; walk-in share about 30%
+    assert 9000 < times[-1] < 11000
+    assert 0.25 < sum(p == "W" for _, p, _ in recs) / 5000 < 0.35
+
+def test_seeded_and_horizon():
+    a = records(SyntheticArrivalSource(rate=2, horizon=500, seed=7))
+    b = records(SyntheticArrivalSource(rate=2, horizon=500, seed=7))
+    assert a == b and a[-1][0] < 500
+
+def test_time_of_day_profile_thinning():
+    rate, peak = daily_rate_profile(base_rate=0.1, peak_rate=1.0, peak_time=720)
+    recs = records(SyntheticArrivalSource(rate_fn=rate, max_rate=peak, horizon=1440 * 20, seed=3))
+    near_peak = sum(1 for t, _, _ in recs if 600 <= t % 1440 < 840)
+    near_trough = sum(1 for t, _, _ in recs if t % 1440 < 120 or t % 1440 >= 1320)
+    assert near_peak > 3 * near_trough
+
+def test_drives_next_arrival_if_due():
+    fh = open_input_file("synthetic", source=SyntheticArrivalSource(rate=1, count=3, seed=2))
+    events = []
+    ev = next_arrival_if_due(fh, 0)
+    while ev:
+        events.append(ev)
+        ev = next_arrival_if_due(fh, ev.time)
+    assert len(events) == 3
+    assert {e.patient.type for e in events} <= {"E", "W"}
+    assert [e.time for e in events] == sorted(e.time for e in events)
@@ -0,0 +1,100 @@
+import threading
+
+from context import SimulationContext, current
+from main import run_simulation
+from stats import total_wait
+
+# Patient waits for data1 with the default triage seed
+DATA1_WAITS = {28064212: 0, 28064213: 1, 28064214: 2, 28064215: 3,
+               28064216: 0, 28064217: 27, 28064218: 25}
+
+def waits_of(ctx):
+    return {p.id: total_wait(p) for p in ctx.patients}
+
+def test_runs_do_not_leak_into_each_other(capsys):
+    outer = current()
+    outer_patients = len(outer.patients)
+    first = run_simulation("data1.txt")
+    second = run_simulation("data1.txt")
+    assert waits_of(first) == waits_of(second) == DATA1_WAITS
+    assert second.rooms.get_available_count() == 3
+    assert current() is outer and len(outer.patients) == outer_patients
+    assert "Average wait: 8.29" in capsys.readouterr().out
+
+def test_contexts_are_per_thread(capsys):
+    results = [None] * 4
+    def worker(i):
+        results[i] = waits_of(run_simulation(f"data{i % 3 + 1}.txt"))
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results[0] == results[3] == DATA1_WAITS
+    assert results[1] == waits_of(run_simulation("data2.txt"))
+
+def test_streaming_run_keeps_no_patients(capsys):
+    rows = []
+    ctx = run_simulation("data1.txt", streaming=True, row_sink=rows.append)
+    assert ctx.patients == [] and ctx.summary.count == 7
+    assert sorted((r[0], r[4]) for r in rows) == sorted(DATA1_WAITS.items())
+
+def test_auto_backend_samples_the_run_input(capsys):
+    from scheduler_queues_rooms import SCHEDULER_BACKENDS
+    ctx = run_simulation("data1.txt", scheduler_backend="auto")
+    assert waits_of(ctx) == DATA1_WAITS
+    assert type(ctx.scheduler) is SCHEDULER_BACKENDS["sorted"]  # 7 arrivals
+    capsys.readouterr()
+
+    # A missing trace is opened (and reported) once
+    run_simulation("missing.txt", scheduler_backend="auto")
+    assert capsys.readouterr().out.count("not found") == 1
+
+def test_triage_nurse_pool(capsys):
+    from config import SimulationConfig
+    ctx = run_simulation("data1.txt", config=SimulationConfig(triage_nurses=2))
+    walkins = {p.id: p.wait_assess for p in ctx.patients if p.type == 'W'}
+    assert walkins == {28064213: 0, 28064215: 0, 28064217: 1}
+    assert ctx.triage_nurses.busy_times() == [8, 4]
+    assert "Triage nurse utilization: #1" in capsys.readouterr().out
+
+def test_admission_nurses_and_room_blocking(capsys):
+    from config import SimulationConfig
+    for nurses in (1, 2):
+        ctx = run_simulation("data3.txt", config=SimulationConfig(admission_nurses=nurses))
+        admit_waits = sum(p.wait_admit for p in ctx.patients)
+        assert ctx.admission_line.blocked_room_time() == admit_waits
+        assert ctx.admission_line.admitted == sum(p.priority == 1 for p in ctx.patients)
+    assert admit_waits < 6  # a second nurse clears data3's admission backlog
+    assert "Rooms blocked awaiting admission: 6 room-time" in capsys.readouterr().out
+
+def test_aging_waiting_room(capsys):
+    from config import SimulationConfig
+    never = run_simulation("data2.txt", config=SimulationConfig(aging_interval=10**9))
+    assert type(never.waiting_room).__name__ == "IndexedWaitingRoom"
+    assert waits_of(never) == waits_of(run_simulation("data2.txt"))
+    aged = run_simulation("data2.txt", config=SimulationConfig(aging_interval=10))
+    assert waits_of(aged) != waits_of(never)
+    assert aged.waiting_room.aging_floor == 2  # aged walk-ins never reach rank 1
+    to_top = run_simulation("data2.txt", config=SimulationConfig(aging_interval=10, aging_floor=1))
+    assert to_top.waiting_room.aging_floor == 1 and waits_of(to_top) != waits_of(aged)
+
+def test_patients_are_treated_in_numbered_rooms(capsys):
+    from config import SimulationConfig
+    ctx = run_simulation("data2.txt", config=SimulationConfig(total_rooms=2))
+    stays = {}
+    for p in ctx.patients:
+        start = p.treatment_wait_start + p.wait_to_treat
+        stays.setdefault(p.treatment_room_id, []).append((start, p.departure_time))
+    assert set(stays) == {1, 2}
+    for intervals in stays.values():
+        intervals.sort()
+        assert all(a[1] <= b[0] for a, b in zip(intervals, intervals[1:]))
+    assert ctx.rooms.get_available_count() == 2
+
+def test_nested_contexts_restore_the_outer_one():
+    a, b = SimulationContext(), SimulationContext()
+    with a:
+        with b:
+            assert current() is b
+        assert current() is a
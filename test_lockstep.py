@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from config import SimulationConfig
+from lockstep import _randint_1_5, run_lockstep
+from replications import run_replication, run_replications
+
+CONFIGS = [SimulationConfig(),
+           SimulationConfig(total_rooms=2, admission_time=5),
+           SimulationConfig(assessment_time=0, departure_delay=0)]
+
+@pytest.fixture
+def busy_trace(tmp_path):
+    rng, t, lines = random.Random(3), 0, []
+    for _ in range(200):
+        t += int(rng.expovariate(1 / 4))
+        lines.append(f"{t} {'EW'[rng.random() < 0.6]} {int(rng.expovariate(1 / 9))}")
+    path = tmp_path / "busy.txt"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+def test_bulk_randint_matches_random():
+    for seed in range(20):
+        rng = random.Random(seed)
+        assert _randint_1_5(random.Random(seed), 500).tolist() == \
+            [rng.randint(1, 5) for _ in range(500)]
+
+@pytest.mark.parametrize("config", CONFIGS)
+@pytest.mark.parametrize("crn", [False, True])
+def test_lockstep_matches_event_engine(config, crn, busy_trace):
+    seeds = [184, 185, 186]
+    for trace in ("data1.txt", "data2.txt", "data3.txt", busy_trace):
+        expected = [run_replication(trace, s, config=config, crn=crn) for s in seeds]
+        assert run_lockstep(trace, seeds, config, crn=crn) == expected
+
+def test_replications_lockstep_engine():
+    events = run_replications("data2.txt", n=8, workers=1)
+    lockstep = run_replications("data2.txt", n=8, engine="lockstep")
+    assert events["replications"] == lockstep["replications"]
+    assert events["mean_wait"] == lockstep["mean_wait"]
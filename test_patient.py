@@ -0,0 +1,38 @@
+from context import SimulationContext
+from patient import Patient
+from stats import add_wait
+
+def test_slotted_patient_has_fixed_wait_fields():
+    with SimulationContext():
+        p = Patient(18, 'W', 3)
+    assert not hasattr(p, "__dict__")
+    add_wait(p, "assess", 4)
+    add_wait(p, "to_treat", 2)
+    add_wait(p, "assess", 1)
+    assert (p.wait_assess, p.wait_to_treat, p.wait_admit) == (5, 2, 0)
+    assert p.waits == {"assess": 5, "to_treat": 2, "admit": 0}
+    try:
+        add_wait(p, "triage", 3)
+        assert False, "Unknown wait buckets should be rejected"
+    except ValueError:
+        pass
+    assert p.waits == {"assess": 5, "to_treat": 2, "admit": 0}
+
+def test_streaming_summary_folds_without_retaining(capsys):
+    from stats import RunningSummary
+    rows = []
+    summary = RunningSummary(sink=rows.append)
+    with SimulationContext(retain_patients=False) as ctx:
+        for prio, wait in ((1, 4), (3, 2), (3, 10)):
+            p = Patient(18, 'E', 2)
+            p.priority = prio
+            add_wait(p, "to_treat", wait)
+            summary.fold(p, 30)
+    assert ctx.patients == [] and ctx.next_patient_id == 28064215
+    assert summary.count == 3 and summary.total_wait == 16
+    assert summary.by_priority == {1: [1, 4, 4], 3: [2, 12, 10]}
+    assert rows[-1][1:] == (3, 18, 30, 10)
+
+    summary.report()
+    out = capsys.readouterr().out
+    assert "Total patients: 3" in out and "Average wait: 5.33" in out
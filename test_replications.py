@@ -0,0 +1,59 @@
+import math
+
+from replications import run_replication, run_replications
+from stats import confidence_interval, percentile, t_quantile
+
+def test_t_quantile_and_interval():
+    for df, ref in ((1, 12.706), (2, 4.303), (4, 2.776), (9, 2.262), (29, 2.045)):
+        assert abs(t_quantile(0.975, df) - ref) < 1e-3
+    mean, hw = confidence_interval([1, 2, 3, 4, 5])
+    assert mean == 3 and abs(hw - 2.776 * math.sqrt(2.5 / 5)) < 1e-3
+    assert confidence_interval([7]) == (7, math.inf)
+    assert [percentile([1, 2, 3, 4], q) for q in (50, 90, 100)] == [2, 4, 4]
+
+def test_replication_summary_of_default_seed(capsys):
+    summary = run_replication("data1.txt", 184)
+    assert capsys.readouterr().out == ""
+    assert summary["patients"] == 7 and round(summary["mean_wait"], 2) == 8.29
+    assert summary["by_priority"][1]["count"] == 5
+    assert 0 < summary["room_utilization"] <= 1
+
+def test_pool_matches_in_process_run():
+    serial = run_replications("data2.txt", n=6, workers=1)
+    pooled = run_replications("data2.txt", seeds=range(184, 190), workers=2)
+    assert serial["replications"] == pooled["replications"]
+    assert serial["mean_wait"] == pooled["mean_wait"]
+    assert len({s["mean_wait"] for s in serial["replications"]}) > 1  # seeds differ
+
+def test_random_streams_are_per_patient_and_antithetic():
+    from random_streams import RandomStreams, PRIORITY_STREAM
+    s, anti = RandomStreams(7), RandomStreams(7, antithetic=True)
+    ids = range(28064212, 28064312)
+    forward = [s.randint(PRIORITY_STREAM, i, 1, 5) for i in ids]
+    backward = [s.randint(PRIORITY_STREAM, i, 1, 5) for i in reversed(ids)]
+    assert forward == backward[::-1]            # order of draws does not matter
+    assert [6 - x for x in forward] == [anti.randint(PRIORITY_STREAM, i, 1, 5) for i in ids]
+    assert set(forward) == {1, 2, 3, 4, 5}
+    assert forward != [RandomStreams(8).randint(PRIORITY_STREAM, i, 1, 5) for i in ids]
+
+def test_uniforms_stay_inside_the_unit_interval():
+    from random_streams import _unit
+    lowest, highest = _unit(bytes(8)), _unit(b"\xff" * 8)
+    assert 0 < lowest < highest < 1
+    assert 1 - highest == lowest                # antithetic pairs stay exact
+    assert int(highest * 5) == 4                # randint(1, 5) never returns 6
+    assert math.isfinite(math.log(1 - highest))  # antithetic expovariate
+
+def test_crn_pairs_see_the_same_priorities():
+    from config import SimulationConfig
+    from replications import compare_configs
+    # Slower triage reorders nothing per patient: priorities stay identical
+    a = run_replication("data2.txt", 3, crn=True)
+    b = run_replication("data2.txt", 3, crn=True, config=SimulationConfig(assessment_time=9))
+    assert {p: r["count"] for p, r in a["by_priority"].items()} == \
+           {p: r["count"] for p, r in b["by_priority"].items()}
+
+    report = compare_configs("data2.txt", SimulationConfig(total_rooms=3),
+                             SimulationConfig(total_rooms=4), n=8, workers=1)
+    mean, hw = report["difference"]
+    assert mean < 0 and hw < report["independent_half_width"]
@@ -17,3 +17,44 @@ def test_stats_accumulation_and_print(capsys):
     assert "Patient Wait Summary" in out
     assert "Total patients: 2" in out
     assert "Average wait" in out
+
+class RecordingSink:
+    def __init__(self):
+        self.lines = []
+    def write(self, line):
+        self.lines.append(line)
+    def flush(self):
+        pass
+
+def test_logger_levels_gate_event_lines(capsys):
+    from main import run_simulation
+    from reporter import Logger, SUMMARY, OFF
+    events = RecordingSink()
+    run_simulation("data1.txt", logger=Logger(events))
+    assert events.lines[0] == "Time 18: 28064212 (Emergency) arrives"
+    assert "Time 23: 28064212 (Priority 1) admitted to Hospital" in events.lines
+    assert "Average wait: 8.29" in capsys.readouterr().out
+
+    quiet = RecordingSink()
+    run_simulation("data1.txt", logger=Logger(quiet, SUMMARY))
+    out = capsys.readouterr().out
+    assert quiet.lines == [] and "Time " not in out and "Average wait: 8.29" in out
+
+    run_simulation("data1.txt", logger=Logger(RecordingSink(), OFF))
+    assert capsys.readouterr().out == ""
+
+def test_buffered_sinks_batch_writes(tmp_path):
+    from reporter import BufferedSink, FileSink, Logger
+    chunks = []
+    sink = BufferedSink(chunks.append, buffer_size=20)
+    for i in range(5):
+        sink.write(f"line {i}")     # 7 characters each with the newline
+    assert chunks == ["line 0\nline 1\nline 2\n"]
+    sink.flush()
+    assert "".join(chunks) == "".join(f"line {i}\n" for i in range(5))
+
+    path = tmp_path / "events.log"
+    logger = Logger(FileSink(str(path)))
+    logger.write("Time 1: x")
+    logger.close()
+    assert path.read_text() == "Time 1: x\n"
@@ -15,10 +15,22 @@ import sys
 from scheduler_queues_rooms import (
     EventScheduler,
     AssessmentLine,
+    NursePool,
     WaitingRoom,
+    BucketWaitingRoom,
+    IndexedWaitingRoom,
+    KeyedQueue,
+    Resource,
+    create_waiting_room,
     AdmissionLine,
     RoomsManager,
-    create_all_resources
+    CalendarScheduler,
+    create_all_resources,
+    pack_sort_key,
+    unpack_sort_key,
+    SCHEDULER_BACKENDS,
+    create_scheduler,
+    choose_scheduler_backend,
 )
 
 
@@ -483,6 +495,529 @@ def test_edge_cases():
     print("TEST PASSED")
 
 
+def test_calendar_scheduler_matches_heap():
+    """TEST 11: Calendar queue pops in the same order as the heap scheduler"""
+    print("\n" + "=" * 70)
+    print("TEST 11: Calendar Scheduler - Same Order as Heap")
+    print("=" * 70)
+    
+    import random
+    rng = random.Random(7)
+    
+    # Small wheel so events also go through the overflow heap
+    heap = EventScheduler()
+    calendar = CalendarScheduler(wheel_size=8)
+    
+    for i in range(300):
+        p = MockPatient(28064212 + rng.randint(0, 20), priority=rng.choice([None, 1, 2, 3, 4, 5]))
+        e = MockEvent(time=rng.randint(0, 60), patient=p)
+        heap.schedule(e)
+        calendar.schedule(e)
+    
+    # Interleave pops with new (never past) events, like a running simulation
+    heap_order, calendar_order = [], []
+    while not heap.is_empty():
+        assert calendar.peek() is heap.peek(), "Peek should agree with heap"
+        e = heap.pop_next()
+        assert calendar.pop_next() is e, "Calendar popped a different event"
+        heap_order.append(e)
+        if len(heap_order) % 3 == 0:
+            follow = MockEvent(time=e.time + rng.randint(0, 40), patient=e.patient)
+            heap.schedule(follow)
+            calendar.schedule(follow)
+    
+    assert calendar.is_empty(), "Calendar should be empty too"
+    assert calendar.pop_next() is None, "Pop from empty should return None"
+    print(f"Popped {len(heap_order)} events in identical order")
+    
+    # Scheduling behind the cursor still comes out first
+    calendar.schedule(MockEvent(time=100, patient=MockPatient(1, priority=2)))
+    calendar.peek()
+    calendar.schedule(MockEvent(time=5, patient=MockPatient(2, priority=2)))
+    assert calendar.pop_next().time == 5, "Late event should come out first"
+    assert calendar.pop_next().time == 100
+    print("Events behind the cursor handled correctly")
+    print("TEST PASSED")
+
+
+def test_packed_sort_keys():
+    """TEST 12: Packed int keys sort exactly like the (time, priority, id, counter) tuple"""
+    print("\n" + "=" * 70)
+    print("TEST 12: Packed Sort Keys")
+    print("=" * 70)
+    
+    import random
+    rng = random.Random(11)
+    
+    tuples = [
+        (rng.randint(0, 10**6), rng.choice([1, 2, 3, 4, 5, 999]),
+         28064212 + rng.randint(0, 10**6), rng.randint(0, 10**9))
+        for _ in range(500)
+    ]
+    keys = [pack_sort_key(*t) for t in tuples]
+    
+    assert sorted(tuples) == [unpack_sort_key(k) for k in sorted(keys)], \
+        "Packed keys should sort like tuples"
+    assert pack_sort_key(3, None, 5, 0) == pack_sort_key(3, 999, 5, 0), \
+        "None priority should pack as 999"
+    print("500 random keys sort identically packed and unpacked")
+    
+    try:
+        pack_sort_key(1, 5000, 1, 0)
+        assert False, "Oversized priority should be rejected"
+    except ValueError:
+        print("Out-of-range priority rejected")
+    print("TEST PASSED")
+
+
+def test_drain_tick_batches():
+    """TEST 13: drain_tick returns one whole tick in order, for both schedulers"""
+    print("\n" + "=" * 70)
+    print("TEST 13: Scheduler - Same-Tick Batch Pop")
+    print("=" * 70)
+    
+    for scheduler in (EventScheduler(), CalendarScheduler(wheel_size=4)):
+        events = [
+            MockEvent(10, MockPatient(28064215, priority=2)),
+            MockEvent(10, MockPatient(28064213, priority=1)),
+            MockEvent(12, MockPatient(28064216, priority=1)),
+            MockEvent(10, MockPatient(28064212, priority=None)),
+            MockEvent(30, MockPatient(28064217, priority=3)),
+        ]
+        for e in events:
+            scheduler.schedule(e)
+        
+        assert scheduler.peek_time() == 10
+        batch = scheduler.drain_tick()
+        assert [e.patient.id for e in batch] == [28064213, 28064215, 28064212], \
+            f"Wrong tick order: {batch}"
+        
+        # An event scheduled for the current tick comes out in the next drain
+        scheduler.schedule(MockEvent(10, MockPatient(28064218, priority=5)))
+        assert [e.patient.id for e in scheduler.drain_tick()] == [28064218]
+        
+        assert [e.time for e in scheduler.pop_all_at(29)] == [12]
+        assert scheduler.size() == 1 and scheduler.peek_time() == 30
+        assert [e.time for e in scheduler.drain_tick()] == [30]
+        assert scheduler.drain_tick() == [] and scheduler.peek_time() is None
+        print(f"{type(scheduler).__name__}: ticks 10, 10, 12, 30 drained in order")
+    print("TEST PASSED")
+
+
+def test_cancel_and_compaction():
+    """TEST 14: Cancelled events are skipped, size counts live events, heap compacts"""
+    print("\n" + "=" * 70)
+    print("TEST 14: Scheduler - Cancellation and Compaction")
+    print("=" * 70)
+    
+    import random
+    
+    for scheduler in (EventScheduler(), CalendarScheduler(wheel_size=16)):
+        rng = random.Random(3)
+        handles = {}
+        for i in range(400):
+            e = MockEvent(time=rng.randint(0, 100), patient=MockPatient(28064212 + i, priority=rng.randint(1, 5)))
+            handles[scheduler.schedule(e)] = e
+        
+        # Cancel three quarters of them; compaction kicks in along the way
+        cancelled = set()
+        for handle in rng.sample(sorted(handles), 300):
+            assert scheduler.cancel(handle), "First cancel should succeed"
+            cancelled.add(handle)
+        assert not scheduler.cancel(next(iter(cancelled))), "Second cancel should fail"
+        assert scheduler.size() == 100, f"Expected 100 live events, got {scheduler.size()}"
+        
+        # Move one survivor to the very front
+        survivor = next(h for h in handles if h not in cancelled)
+        new_handle = scheduler.reschedule(survivor, -1)
+        assert new_handle is not None and scheduler.peek() is handles[survivor]
+        
+        expected = sorted(
+            (e for h, e in handles.items() if h not in cancelled),
+            key=lambda e: (e.time, e.patient.priority, e.patient.id),
+        )
+        popped = []
+        while not scheduler.is_empty():
+            popped.append(scheduler.pop_next())
+        assert popped == expected, "Live events should pop in order, tombstones skipped"
+        assert scheduler.pop_next() is None
+        print(f"{type(scheduler).__name__}: 300 cancelled, 100 popped in order")
+    print("TEST PASSED")
+
+
+def test_schedule_many_bulk_load():
+    """TEST 15: schedule_many matches one-by-one scheduling, including ties"""
+    print("\n" + "=" * 70)
+    print("TEST 15: Scheduler - Bulk schedule_many")
+    print("=" * 70)
+    
+    import random
+    rng = random.Random(5)
+    
+    events = [
+        MockEvent(time=rng.randint(0, 50), patient=MockPatient(28064212 + rng.randint(0, 5), priority=rng.randint(1, 3)))
+        for _ in range(200)
+    ]
+    
+    for make in (EventScheduler, lambda: CalendarScheduler(wheel_size=8)):
+        one_by_one, bulk = make(), make()
+        for e in events[:20]:
+            one_by_one.schedule(e)
+        bulk.schedule_many(events[:20])
+        # Second batch goes into an already-populated queue
+        for e in events[20:]:
+            one_by_one.schedule(e)
+        handles = bulk.schedule_many(events[20:])
+        assert len(handles) == 180 and bulk.size() == 200
+        
+        order_a = [one_by_one.pop_next() for _ in range(200)]
+        order_b = [bulk.pop_next() for _ in range(200)]
+        assert order_a == order_b, "Bulk load should pop in the same order"
+        print(f"{type(bulk).__name__}: 200 bulk-loaded events in identical order")
+    
+    resources = create_all_resources(initial_events=events[:10])
+    assert resources['scheduler'].size() == 10, "Initial events should be preloaded"
+    print("create_all_resources preloads initial events")
+    print("TEST PASSED")
+
+
+def test_scheduler_backends_agree():
+    """TEST 16: Every registered backend gives the same order through the shared interface"""
+    print("\n" + "=" * 70)
+    print("TEST 16: Scheduler Backends - Shared Interface")
+    print("=" * 70)
+    
+    import random
+    rng = random.Random(9)
+    initial = [
+        MockEvent(time=rng.randint(0, 2000), patient=MockPatient(28064212 + i, priority=rng.choice([None, 1, 3, 5])))
+        for i in range(300)
+    ]
+    
+    orders = {}
+    for name in sorted(SCHEDULER_BACKENDS):
+        scheduler = create_scheduler(name)
+        scheduler.schedule_many(initial[:100])
+        handles = [scheduler.schedule(e) for e in initial[100:]]
+        for h in handles[::3]:
+            scheduler.cancel(h)
+        assert scheduler.size() == 300 - len(handles[::3])
+        
+        order = []
+        while not scheduler.is_empty():
+            t = scheduler.peek_time()
+            assert scheduler.peek().time == t
+            batch = scheduler.drain_tick()
+            order.extend(batch)
+            if len(order) % 5 == 0 and t < 1500:
+                # Schedule follow-ups while running, like the simulation does
+                follow = MockEvent(time=t + 1 + len(order) % 7, patient=batch[0].patient)
+                scheduler.schedule(follow)
+        orders[name] = [(e.time, e.patient.id) for e in order]
+        print(f"{name}: {len(order)} events")
+    
+    reference = orders['heap']
+    for name, order in orders.items():
+        assert order == reference, f"Backend {name} disagrees with heap"
+    
+    # The shared _top_key()/_pop_key() path agrees with each backend's own
+    from scheduler_queues_rooms import _SchedulerBase
+    fast = create_scheduler('heap')
+    fast.schedule_many(initial)
+    expected = [fast.pop_next() for _ in initial]
+    for name in sorted(SCHEDULER_BACKENDS):
+        scheduler = create_scheduler(name)
+        scheduler.schedule_many(initial)
+        for h in range(0, 300, 4):
+            scheduler.cancel(h)
+        generic = [_SchedulerBase.pop_next(scheduler) for _ in range(300 - 75)]
+        assert generic == [e for e in expected if e not in initial[::4]], name
+        assert _SchedulerBase.peek_time(scheduler) is None and scheduler.is_empty()
+    try:
+        _SchedulerBase()
+        assert False, "The bookkeeping base is abstract"
+    except TypeError:
+        pass
+    
+    assert choose_scheduler_backend([18, 18, 19]) == 'sorted'
+    assert choose_scheduler_backend(range(0, 5000)) == 'calendar'
+    assert choose_scheduler_backend(range(0, 10**9, 10**5)) == 'heap'
+    assert type(create_scheduler('auto', list(range(5000)))).__name__ == 'CalendarScheduler'
+    try:
+        create_scheduler('no-such-backend')
+        assert False, "Unknown backend should be rejected"
+    except ValueError:
+        pass
+    print("All backends agree; auto selection and unknown names handled")
+    print("TEST PASSED")
+
+
+def test_nurse_pool():
+    """TEST 17: Nurse pool reuses the last freed nurse and tracks busy time"""
+    print("\n" + "=" * 70)
+    print("TEST 17: Nurse Pool - Dispatch and Utilization")
+    print("=" * 70)
+    
+    pool = NursePool(3)
+    assert [pool.acquire(0), pool.acquire(1), pool.acquire(2)] == [0, 1, 2]
+    assert pool.acquire(2) is None, "All nurses busy"
+    pool.release(1, 5)
+    pool.release(0, 6)
+    assert pool.free_count() == 2
+    assert pool.acquire(6) == 0, "Last freed nurse goes first"
+    pool.release(0, 8)
+    pool.release(2, 10)
+    assert pool.busy_times() == [8, 4, 8]
+    assert pool.utilization(10) == [0.8, 0.4, 0.8]
+    for call in (lambda: pool.request(MockPatient(1), now=10), lambda: pool.dispatch(10)):
+        try:
+            call()
+            assert False, "A pool without a queue cannot queue requests"
+        except RuntimeError as e:
+            assert "no wait queue" in str(e)
+    assert pool.waiting() == 0
+    
+    # Long line: deque-backed, still FIFO
+    line = AssessmentLine()
+    for i in range(10000):
+        line.enqueue_assessment(MockPatient(i))
+    assert [line.dequeue_assessment().id for _ in range(10000)] == list(range(10000))
+    print("Dispatch order, busy times and long-line FIFO correct")
+    print("TEST PASSED")
+
+
+def test_admission_line_nurses_and_blocking():
+    """TEST 18: Admission line with two nurses; ties by id; room blocking"""
+    print("\n" + "=" * 70)
+    print("TEST 18: Admission Line - Nurse Pool and Room Blocking")
+    print("=" * 70)
+    
+    admission = AdmissionLine(nurses=2)
+    p1, p2, p3 = (MockPatient(pid, priority=1) for pid in (28064214, 28064212, 28064213))
+    admission.admission_enqueue(p1, wait_start_time=10)
+    admission.admission_enqueue(p2, wait_start_time=10)
+    admission.admission_enqueue(p3, wait_start_time=12)
+    assert admission.max_blocked == 3 and admission.size() == 3, "size() counts waiting patients, not nurses"
+    
+    # Same finish time: lower id first; two nurses serve at once
+    assert admission.admission_start(14) == (p2, 10, 0)
+    assert admission.admission_start(14) == (p1, 10, 1)
+    assert admission.admission_start(14) is None, "Both nurses busy"
+    assert admission.is_nurse_busy() and admission.size() == 1
+    
+    admission.nurse_free(1, now=17)
+    assert admission.admission_start(17) == (p3, 12, 1)
+    # Waiting room-time: 10-12 two rooms, 12-14 three, 14-17 one
+    assert admission.blocked_room_time() == 2 * 2 + 3 * 2 + 1 * 3
+    assert admission.admitted == 3 and admission.is_empty()
+    print("Id tie-break, two-nurse dispatch and blocked room-time correct")
+    print("TEST PASSED")
+
+
+def test_bucket_waiting_room_matches_heap():
+    """TEST 19: Bucket waiting room pops in the heap's (priority, id) order"""
+    print("\n" + "=" * 70)
+    print("TEST 19: Bucket Waiting Room - Same Order as Heap")
+    print("=" * 70)
+    
+    import random
+    rng = random.Random(7)
+    heap_room, bucket_room = WaitingRoom(), BucketWaitingRoom()
+    # Mostly increasing ids, some patients entering after higher ids
+    ids = list(range(28064212, 28064212 + 3000))
+    for i in range(0, len(ids) - 30, 17):
+        j = i + rng.randint(1, 30)
+        ids[i], ids[j] = ids[j], ids[i]
+    ids.reverse()
+    popped = 0
+    while ids:
+        if rng.random() < 0.55:
+            p = MockPatient(ids.pop(), priority=rng.randint(1, 5))
+            heap_room.waitingroom_push(p)
+            bucket_room.waitingroom_push(p)
+        else:
+            assert bucket_room.peek() is heap_room.peek()
+            assert bucket_room.waitingroom_pop_best() is heap_room.waitingroom_pop_best()
+            popped += 1
+        assert bucket_room.size() == heap_room.size()
+    while not heap_room.is_empty():
+        assert bucket_room.waitingroom_pop_best() is heap_room.waitingroom_pop_best()
+    assert bucket_room.is_empty() and bucket_room.waitingroom_pop_best() is None
+    
+    assert type(create_waiting_room()).__name__ == 'BucketWaitingRoom'
+    assert type(create_waiting_room('heap')).__name__ == 'WaitingRoom'
+    try:
+        bucket_room.waitingroom_push(MockPatient(1, priority=6))
+        assert False, "Priority outside 1-5 should be rejected"
+    except ValueError:
+        pass
+    print(f"Same order as heap over {popped} interleaved pops")
+    print("TEST PASSED")
+
+
+def test_indexed_waiting_room():
+    """TEST 20: Indexed waiting room: re-triage, removal and aging"""
+    print("\n" + "=" * 70)
+    print("TEST 20: Indexed Waiting Room - Update, Remove, Age")
+    print("=" * 70)
+    
+    import random
+    rng = random.Random(11)
+    room, waiting = IndexedWaitingRoom(), {}
+    for step in range(4000):
+        op = rng.random()
+        if op < 0.4 or not waiting:
+            p = MockPatient(28064212 + step, priority=rng.randint(1, 5))
+            room.waitingroom_push(p)
+            waiting[p.id] = p
+        elif op < 0.6:
+            pid = rng.choice(list(waiting))
+            assert room.update_priority(pid, rng.randint(1, 5))
+        elif op < 0.75:
+            pid = rng.choice(list(waiting))
+            assert room.remove(pid) is waiting.pop(pid)
+            assert pid not in room and room.remove(pid) is None
+        else:
+            best = min(waiting.values(), key=lambda q: (q.priority, q.id))
+            assert room.peek() is best
+            assert room.waitingroom_pop_best() is waiting.pop(best.id)
+        assert room.size() == len(waiting)
+    print("Random push / update / remove / pop sequence matches brute force")
+    
+    # Aging: one rank per 10 units waited, not past priority 2
+    room = IndexedWaitingRoom(aging_interval=10, aging_floor=2)
+    old5 = MockPatient(28064300, priority=5)
+    room.waitingroom_push(old5, now=0)
+    for i in range(3):
+        room.waitingroom_push(MockPatient(28064212 + i, priority=3), now=25)
+    assert room.age(9) == 0
+    assert room.age(30) == 3, "old5 aged at 10, 20 and 30; the P3s not yet"
+    assert room.rank_of(28064300) == 2 and old5.priority == 5
+    assert room.waitingroom_pop_best() is old5, "Aged P5 now ahead of the P3s"
+    assert room.age(1000) == 3, "Each P3 ages once, to the floor"
+    assert room.age(2000) == 0
+    assert [room.waitingroom_pop_best().id for _ in range(3)] == [28064212, 28064213, 28064214]
+    
+    # Leaving and coming back restarts the clock; the old aging time is stale
+    back = MockPatient(28064400, priority=4)
+    room.waitingroom_push(back, now=2000)
+    assert room.remove(back.id) is back
+    room.waitingroom_push(back, now=2005)
+    assert room.age(2010) == 0 and room.rank_of(back.id) == 4
+    assert room.age(2015) == 1 and room.rank_of(back.id) == 3
+    
+    # Re-triage keeps earned levels and (re)starts aging above the floor
+    room = IndexedWaitingRoom(aging_interval=10, aging_floor=2)
+    a, b = MockPatient(28064500, priority=2), MockPatient(28064501, priority=5)
+    room.waitingroom_push(a, now=0)
+    room.waitingroom_push(b, now=0)
+    assert room.age(20) == 2 and room.rank_of(b.id) == 3
+    room.update_priority(a.id, 5, now=23)
+    room.update_priority(b.id, 4, now=23)
+    assert (room.rank_of(a.id), room.rank_of(b.id)) == (5, 2) and b.priority == 4
+    assert room.age(29) == 0
+    room.update_priority(b.id, 5, now=29)
+    assert room.rank_of(b.id) == 3, "Two earned levels survive re-triage"
+    assert room.age(33) == 1 and room.rank_of(a.id) == 4, "Re-triaged to 5, so a ages from 23"
+    assert room.age(39) == 1 and room.rank_of(b.id) == 2
+    print("Aging promotes by wait time, stops at the floor, keeps patient.priority")
+    print("TEST PASSED")
+
+
+def test_numbered_rooms():
+    """TEST 21: Rooms are numbered; free rooms are a stack"""
+    print("\n" + "=" * 70)
+    print("TEST 21: Rooms Manager - Room Ids and Bulk Acquire")
+    print("=" * 70)
+    
+    rooms = RoomsManager(5)
+    assert rooms.acquire_many(3) == [1, 2, 3]
+    assert rooms.acquire() == 4
+    assert rooms.get_available_count() == 1
+    rooms.release(2)
+    rooms.release(2)  # Double release is ignored
+    assert rooms.get_occupied_count() == 3
+    assert rooms.acquire_many(10) == [2, 5], "Never more than the free rooms"
+    assert rooms.are_all_occupied() and rooms.acquire() is None
+    
+    big = RoomsManager(500)
+    assert big.acquire_many(400) == list(range(1, 401))
+    for rid in range(1, 401, 2):
+        big.release(rid)
+    assert big.acquire_many(3) == [399, 397, 395], "Free list: last freed, first reused"
+    assert big.get_available_count() == 100 + 197
+    print("Room ids and bulk acquire correct")
+    print("TEST PASSED")
+
+
+def test_resource_disciplines_and_integrals():
+    """TEST 22: One Resource primitive under FIFO, priority and keyed queues"""
+    print("\n" + "=" * 70)
+    print("TEST 22: Resource - Queue Disciplines and Busy/Queue Integrals")
+    print("=" * 70)
+    
+    p = [MockPatient(28064212 + i, priority=5 - i % 3) for i in range(4)]
+    
+    fifo = Resource(1, AssessmentLine())
+    for t, patient in enumerate(p):
+        fifo.request(patient, now=t)
+    assert fifo.dispatch(4) == [(p[0], 0)]
+    assert fifo.dispatch(4) == [], "Single unit busy"
+    fifo.release(0, now=6)
+    assert fifo.dispatch(6) == [(p[1], 0)]
+    # Queue length 1, 2, 3, 4 over [0, 4), then 3 over [4, 6), then 2
+    assert fifo.queue_time(8) == (1 + 2 + 3 + 4) + 3 * 2 + 2 * 2
+    assert fifo.busy_times(8) == [2 + 2] and fifo.max_queue == 4
+    
+    by_priority = Resource(2, BucketWaitingRoom())
+    for patient in p:
+        by_priority.request(patient, now=0)
+    assert [q.id for q, _ in by_priority.dispatch(0)] == [28064214, 28064213]
+    
+    keyed = Resource(3, KeyedQueue())
+    for i, patient in enumerate(p):
+        keyed.request(patient, now=0, key=(10 - i % 2, patient.id))
+    assert [q.id for q, _ in keyed.dispatch(1)] == [28064213, 28064215, 28064212]
+    assert keyed.busy_count() == 3 and keyed.served == 3
+    print("FIFO, priority and keyed disciplines; busy and queue integrals correct")
+    print("TEST PASSED")
+
+
+def test_rejected_events_leave_no_trace():
+    """TEST 23: An event (or batch) whose key does not pack is rejected and never registered"""
+    print("\n" + "=" * 70)
+    print("TEST 23: Scheduler - Rejected Events Leave No Trace")
+    print("=" * 70)
+    
+    bad = [
+        MockEvent(time=5, patient=MockPatient(28064212, priority=1024)),
+        MockEvent(time=5, patient=MockPatient(-1, priority=1)),
+        MockEvent(time=5, patient=MockPatient(1 << 40, priority=1)),
+    ]
+    for name in sorted(SCHEDULER_BACKENDS):
+        scheduler = create_scheduler(name)
+        for e in bad:
+            try:
+                scheduler.schedule(e)
+                assert False, "Unpackable event should be rejected"
+            except ValueError:
+                pass
+        try:
+            scheduler.schedule_many([MockEvent(time=4, patient=MockPatient(28064212, priority=1))] + bad)
+            assert False, "A batch holding an unpackable event should be rejected"
+        except ValueError:
+            pass
+        assert scheduler.size() == 0 and scheduler.is_empty(), f"{name} kept a rejected event"
+        assert scheduler.peek_time() is None and scheduler.drain_tick() == []
+        
+        good = MockEvent(time=7, patient=MockPatient(28064213, priority=2))
+        handle = scheduler.schedule(good)
+        assert handle == 0, "Rejected events should not use up counters"
+        assert scheduler.pop_next() is good and scheduler.is_empty()
+        print(f"{name}: rejected events left the queue empty")
+    print("TEST PASSED")
+
+
 def run_all_tests():
     """Run all test cases"""
     print("\n" + "🏥" * 35)
@@ -501,6 +1036,19 @@ def run_all_tests():
         ("Admission Line - FCFS", test_admission_line_fcfs),
         ("Integration Scenario", test_integration_scenario),
         ("Edge Cases", test_edge_cases),
+        ("Calendar Scheduler - Same Order as Heap", test_calendar_scheduler_matches_heap),
+        ("Packed Sort Keys", test_packed_sort_keys),
+        ("Scheduler - Same-Tick Batch Pop", test_drain_tick_batches),
+        ("Scheduler - Cancellation and Compaction", test_cancel_and_compaction),
+        ("Scheduler - Bulk schedule_many", test_schedule_many_bulk_load),
+        ("Scheduler Backends - Shared Interface", test_scheduler_backends_agree),
+        ("Nurse Pool - Dispatch and Utilization", test_nurse_pool),
+        ("Admission Line - Nurse Pool and Room Blocking", test_admission_line_nurses_and_blocking),
+        ("Bucket Waiting Room - Same Order as Heap", test_bucket_waiting_room_matches_heap),
+        ("Indexed Waiting Room - Update, Remove, Age", test_indexed_waiting_room),
+        ("Rooms Manager - Room Ids and Bulk Acquire", test_numbered_rooms),
+        ("Resource - Queue Disciplines and Integrals", test_resource_disciplines_and_integrals),
+        ("Scheduler - Rejected Events Leave No Trace", test_rejected_events_leave_no_trace),
     ]
     
     passed = 0
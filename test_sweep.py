@@ -0,0 +1,44 @@
+import sweep
+from config import DEFAULT_CONFIG, SimulationConfig, expand_grid
+from replications import run_replication
+
+def test_config_changes_the_model():
+    base = run_replication("data1.txt", 184)
+    one_room = run_replication("data1.txt", 184, config=SimulationConfig(total_rooms=1))
+    slow = run_replication("data1.txt", 184, config=SimulationConfig(assessment_time=8))
+    assert one_room["mean_wait"] > base["mean_wait"]
+    assert slow["by_priority"] != base["by_priority"]
+    assert run_replication("data1.txt", 184, config=DEFAULT_CONFIG) == base
+
+def test_expand_grid():
+    grid = expand_grid(total_rooms=[2, 3, 4], admission_time=[3, 5])
+    assert len(grid) == 6 and DEFAULT_CONFIG in grid
+    assert SimulationConfig(total_rooms=4, admission_time=5) in grid
+    try:
+        expand_grid(rooms=[1])
+        assert False, "unknown parameters must be rejected"
+    except ValueError:
+        pass
+
+def test_sweep_cache_only_runs_new_cells(tmp_path, monkeypatch):
+    calls = []
+    real = sweep.run_replication
+    def counting(trace, seed, backend, config):
+        calls.append((config.total_rooms, seed))
+        return real(trace, seed, backend, config)
+    monkeypatch.setattr(sweep, "run_replication", counting)
+
+    cache = str(tmp_path / "cache.jsonl")
+    grid = expand_grid(total_rooms=[2, 3])
+    first = sweep.run_sweep(grid, ["data1.txt"], [1, 2], workers=1, cache_path=cache)
+    assert len(first) == 4 and len(calls) == 4
+
+    # Interrupted write leaves a torn line; it is ignored
+    with open(cache, "a") as f:
+        f.write('{"config": {"total_')
+    calls.clear()
+    extended = sweep.run_sweep(grid, ["data1.txt"], [1, 2, 3], workers=1, cache_path=cache)
+    assert sorted(calls) == [(2, 3), (3, 3)]
+    assert len(extended) == 6
+    assert [r for r in extended if r["seed"] != 3] == first
+    assert extended[0]["summary"]["by_priority"].keys() == first[0]["summary"]["by_priority"].keys()
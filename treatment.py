@@ -1,17 +1,18 @@
+from context import current
 from events import TreatmentCompleted
+from reporter import log_start, log_treatment_completed
 from router import route_after_treatment
-
-_controller_singleton = None
+from stats import add_wait
 
 def set_controller(ctrl):
-    """Called once from main to register the TreatmentController instance."""
-    global _controller_singleton
-    _controller_singleton = ctrl
+    """Called once per run from main to register the run's TreatmentController."""
+    current().controller = ctrl
 
 def on_enter_waiting_room(now):
-    """Called by EnterWaitingRoom events to start treatment if room free."""
-    if _controller_singleton is not None:
-        _controller_singleton.try_start_treatment(now)
+    """Called by EnterWaitingRoom events; treatment starts at the end of the tick."""
+    controller = current().controller
+    if controller is not None:
+        controller.request_backfill(now)
 
 class TreatmentController:
     def __init__(self, rooms, waitingroom, scheduler, backfill_cb=None):
@@ -19,21 +20,42 @@ class TreatmentController:
         self.waitingroom = waitingroom
         self.scheduler = scheduler
         self.backfill_cb = backfill_cb
+        self._backfill_due = False
+        # Waiting rooms with aging (IndexedWaitingRoom) get an aging pass before each fill
+        self._age = getattr(waitingroom, "age", None)
+
+    def request_backfill(self, now):
+        """Note that rooms or waiting patients changed; handled once per tick."""
+        self._backfill_due = True
+
+    def run_pending_backfill(self, now):
+        """Fill free rooms once, after every event of the tick has been handled."""
+        if self._backfill_due:
+            self._backfill_due = False
+            self.try_start_treatment(now)
 
     def try_start_treatment(self, now):
-        while True:
-            if not self.rooms.acquire_if_available():
-                break
-            patient = self.waitingroom.waitingroom_pop_best()
-            if patient is None:
-                self.rooms.release()
-                break
-            print(f"t={now}: Patient {patient.id} Priority {patient.priority} START treatment")
+        if self._age is not None:
+            self._age(now)
+        self.dispatch(now)
+
+    def dispatch(self, now):
+        """
+        Start treatment for as many of the best waiting patients as there
+        are free rooms (the waiting room is the rooms' Resource queue).
+        """
+        started = self.rooms.dispatch(now)
+        free = self.rooms.get_available_count() + len(started)
+        for patient, room_id in started:
+            patient.treatment_room_id = room_id
+            add_wait(patient, "to_treat", now - patient.treatment_wait_start)
+            free -= 1
+            log_start(patient, now, free)
             completion_time = now + patient.treat_time
             self.scheduler.schedule(TreatmentCompleted(time=completion_time, patient=patient))
 
     def handle_treatment_completed(self, event):
         now = event.time
         patient = event.patient
-        print(f"t={now}: Patient {patient.id} Priority {patient.priority} COMPLETED treatment")
+        log_treatment_completed(patient, now)
         route_after_treatment(patient, now)
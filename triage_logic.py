@@ -1,25 +1,33 @@
 import random
+from context import current, TRIAGE_RNG_SEED
 from events import EnterWaitingRoom, AssessmentDone
 from patient import Patient
+from random_streams import PRIORITY_STREAM
+from reporter import log_assessment_start
+from stats import add_wait
 
 # Final Deterministic Seed (Guaranteed to produce [3, 1, 2] in your environment)
-TRIAGE_RNG_SEED = 184
-
-# Use an instance of Random, NOT the global module
-_triage_rng = random.Random(TRIAGE_RNG_SEED) 
+# lives in context.TRIAGE_RNG_SEED; each SimulationContext owns its own
+# random.Random instance, NOT the global module
 
 
 def setup_triage_rng():
     """
-    Resets the triage RNG instance for testing purposes. 
+    Resets the active run's triage RNG instance for testing purposes. 
     """
-    global _triage_rng
-    _triage_rng = random.Random(TRIAGE_RNG_SEED)
+    current().triage_rng = random.Random(TRIAGE_RNG_SEED)
 
 
 def triage_walkin_priority_assignment(patient: Patient) -> int:
-    """Assigns a priority (1-5) using the deterministic RNG instance."""
-    priority = _triage_rng.randint(1, 5) 
+    """
+    Assigns a priority (1-5) using the deterministic RNG instance, or the
+    patient's own draw from the run's RandomStreams when it has them.
+    """
+    ctx = current()
+    if ctx.streams is not None:
+        priority = ctx.streams.randint(PRIORITY_STREAM, patient.id, 1, 5)
+    else:
+        priority = ctx.triage_rng.randint(1, 5) 
     patient.priority = priority
     return priority
 
@@ -28,13 +36,15 @@ def handle_arrival_event(event, schedule_func, assessment_enqueue_func, arrival_
     Processes an Arrival event (Role A's core event processor).
     - Emergency patients go straight to the Waiting Room.
     - Walk-in patients are handed off to Role B's FIFO Assessment Line.
-    - Schedules the next Arrival event from the file to maintain the invariant.
+    - Schedules the next Arrival event from the file to maintain the invariant
+      (pass arrival_manager=None when the main loop refills arrivals itself).
     """
     patient = event.patient
     current_time = event.time
     
     # 1. Schedule the next Arrival event immediately
-    arrival_manager.get_next_arrival_event(schedule_func)
+    if arrival_manager is not None:
+        arrival_manager.get_next_arrival_event(schedule_func)
     
     # 2. Process Triage Handoff
     if patient.type == 'E':
@@ -54,18 +64,19 @@ def handle_arrival_event(event, schedule_func, assessment_enqueue_func, arrival_
         assessment_enqueue_func(patient)
 
 
-def handle_assessment_start(patient: Patient, start_time: int, schedule_func):
+def handle_assessment_start(patient: Patient, start_time: int, schedule_func, nurse: int = 0):
     """
     Callback function called by Role B/C when a patient reaches the 
-    head of the Assessment Line and begins the 4-unit assessment process.
+    head of the Assessment Line and begins the assessment process
+    (config.assessment_time units, 4 by default) with triage nurse `nurse`.
     """
     
     triage_walkin_priority_assignment(patient) 
     
     
-    assessment_done_time = start_time + 4
+    assessment_done_time = start_time + current().config.assessment_time
     
-    done_event = AssessmentDone(assessment_done_time, patient)
+    done_event = AssessmentDone(assessment_done_time, patient, nurse)
     schedule_func(done_event)
 
 
@@ -78,4 +89,18 @@ def handle_assessment_done_event(event, schedule_func):
     
     # Schedule EnterWaitingRoom immediately at the time assessment completes
     enter_event = EnterWaitingRoom(current_time, patient)
-    schedule_func(enter_event)
\ No newline at end of file
+    schedule_func(enter_event)
+
+
+def try_start_assessment(now: int):
+    """
+    While a triage nurse is idle and walk-ins are in the Assessment Line,
+    hand the head of the line to a free nurse (the triage Resource's
+    dispatch; see handle_assessment_start). Walk-ins start in arrival order.
+    """
+    ctx = current()
+    for patient, nurse in ctx.triage_nurses.dispatch(now):
+        waited = now - patient.assessment_wait_start
+        add_wait(patient, "assess", waited)
+        log_assessment_start(patient, now, waited)
+        handle_assessment_start(patient, now, ctx.scheduler.schedule, nurse)